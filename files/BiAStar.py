@@ -0,0 +1,99 @@
+import time
+from array import array
+from AStar import A_star_Search
+from metrics import check_connected, record_result
+from node import SearchTree
+from structures import CellSet, PriorityQueue
+
+
+class Bidirectional_A_star_Search(A_star_Search):
+    image_name = "A-star-bidirectional"
+
+    def solve(self):
+        """Finds an optimal solution with A* searches from the start and from the goal.
+
+        The paths found are optimal as long as the heuristic is consistent, as the
+        built-in ones are.
+        """
+        # Keep track of the search metrics, see metrics.py
+        self.solution = None
+        num_explored = max_frontier = 0
+        num_generated = 2
+        start_time = time.perf_counter_ns()
+
+        check_connected(self, start_time)
+
+        # Search over integer cell ids, using the maze's precomputed neighbor table
+        table = self.maze.neighbor_table()
+        moves = self.maze.moves
+        size = self.height * self.width
+        start = self.maze.cell(self.start)
+        goal = self.maze.cell(self.goal)
+
+        # One search tree, cost array and frontier per direction. The forward
+        # search heads for the goal and the backward one for the start. The
+        # backward tree records the move from each cell towards the goal, which is
+        # the opposite of the move that reached it (ACTIONS pairs opposites, so i ^ 1)
+        sides = []
+        for root, target in ((start, self.goal), (goal, self.start)):
+            cost = array("i" if size < 2 ** 31 else "q", [-1]) * size
+            cost[root] = 0
+            frontier = PriorityQueue()
+            h = self.h(self.maze.state(root), target)
+            frontier.add(root, (h, h))
+            sides.append((SearchTree(size), cost, frontier, target))
+
+        # initialise explored set, shared by both directions
+        self.explored = CellSet(size)
+
+        # Cost of the best path found so far through a cell reached from both sides
+        best = None
+        meet = None
+
+        while True:
+            forward_frontier, backward_frontier = sides[0][2], sides[1][2]
+            if forward_frontier.empty() or backward_frontier.empty():
+                break
+            if len(forward_frontier) + len(backward_frontier) > max_frontier:
+                max_frontier = len(forward_frontier) + len(backward_frontier)
+
+            # Every path cheaper than the best one so far passes through an open
+            # cell on each side, whose f-cost it can be no cheaper than
+            if best is not None and best <= max(forward_frontier.top_priority()[0], backward_frontier.top_priority()[0]):
+                break
+
+            # Expand the side with the smaller frontier
+            if len(forward_frontier) <= len(backward_frontier):
+                (tree, cost, frontier, target), other_cost, flip = sides[0], sides[1][1], 0
+            else:
+                (tree, cost, frontier, target), other_cost, flip = sides[1], sides[0][1], 1
+
+            node = frontier.remove()
+            self.explored.add(node)
+            num_explored += 1
+            node_cost = cost[node] + 1
+            for action, offset in moves[table[node]]:
+                state = node + offset
+                if cost[state] == -1 or node_cost < cost[state]:
+                    cost[state] = node_cost
+                    tree.add(state, node, action ^ flip)
+                    h = self.h(self.maze.state(state), target)
+                    frontier.add(state, (node_cost + h, h))
+                    num_generated += 1
+
+                    # Keep the cheapest path through a cell reached from both sides
+                    if other_cost[state] != -1 and (best is None or node_cost + other_cost[state] < best):
+                        best = node_cost + other_cost[state]
+                        meet = state
+
+        if meet is None:
+            record_result(self, start_time, num_explored, num_generated, max_frontier)
+            raise Exception("no solution")
+
+        # Join the path from the start to the meeting cell with the one from there to the goal
+        actions, cells = sides[0][0].path(meet)
+        back_actions, back_cells = sides[1][0].reverse_path(meet)
+        actions += back_actions
+        cells += back_cells
+        self.solution = (actions, [self.maze.state(cell) for cell in cells])
+        return record_result(self, start_time, num_explored, num_generated, max_frontier)
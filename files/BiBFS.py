@@ -0,0 +1,86 @@
+import time
+from BFS import BreadthFirstSearch
+from metrics import check_connected, record_result
+from node import SearchTree
+from structures import CellSet
+
+
+class BidirectionalBreadthFirstSearch(BreadthFirstSearch):
+    image_name = "BFS-bidirectional"
+
+    def solve(self):
+        """Finds a shortest solution by searching from the start and the goal at once."""
+
+        # Keep track of the search metrics, see metrics.py
+        self.solution = None
+        num_explored = 0
+        num_generated = max_frontier = 2
+        start_time = time.perf_counter_ns()
+
+        check_connected(self, start_time)
+
+        # Search over integer cell ids, using the maze's precomputed neighbor table
+        table = self.maze.neighbor_table()
+        moves = self.maze.moves
+        size = self.height * self.width
+        start = self.maze.cell(self.start)
+        goal = self.maze.cell(self.goal)
+
+        # One search tree, set of reached cells and current layer per direction. The
+        # backward tree records the move from each cell towards the goal, which is
+        # the opposite of the move that reached it (ACTIONS pairs opposites, so i ^ 1)
+        forward, backward = SearchTree(size), SearchTree(size)
+        reached_forward, reached_backward = CellSet(size), CellSet(size)
+        reached_forward.add(start)
+        reached_backward.add(goal)
+        layer_forward, layer_backward = [start], [goal]
+
+        # Initialize an empty explored set, shared by both directions
+        self.explored = CellSet(size)
+
+        # Expand one whole layer at a time, always on the side with the smaller
+        # layer. The first cell reached from both sides joins two layers whose
+        # depths add up to the length of a shortest path, so the search stops there
+        meet = None
+        while meet is None:
+            # If either side runs out of cells, then no path
+            if not layer_forward or not layer_backward:
+                record_result(self, start_time, num_explored, num_generated, max_frontier)
+                raise Exception("no solution")
+            if len(layer_forward) + len(layer_backward) > max_frontier:
+                max_frontier = len(layer_forward) + len(layer_backward)
+
+            if len(layer_forward) <= len(layer_backward):
+                tree, reached, other, layer, flip = forward, reached_forward, reached_backward, layer_forward, 0
+            else:
+                tree, reached, other, layer, flip = backward, reached_backward, reached_forward, layer_backward, 1
+
+            next_layer = []
+            for node in layer:
+                self.explored.add(node)
+                num_explored += 1
+                for action, offset in moves[table[node]]:
+                    state = node + offset
+                    if state not in reached:
+                        reached.add(state)
+                        tree.add(state, node, action ^ flip)
+                        num_generated += 1
+                        if state in other:
+                            meet = state
+                            break
+                        next_layer.append(state)
+                if meet is not None:
+                    break
+
+            if flip:
+                layer_backward = next_layer
+            else:
+                layer_forward = next_layer
+
+        # Join the path from the start to the meeting cell with the one from there to the goal
+        actions, cells = forward.path(meet)
+        back_actions, back_cells = backward.reverse_path(meet)
+        actions += back_actions
+        cells += back_cells
+        self.solution = (actions, [self.maze.state(cell) for cell in cells])
+        return record_result(self, start_time, num_explored, num_generated, max_frontier)
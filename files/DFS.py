@@ -1,50 +1,30 @@
-import datetime as dt 
-from node import Node
-from structures import Stack
-from PIL import Image, ImageDraw
+import time
+from maze import load_maze
+from metrics import check_connected, record_result
+from node import SearchTree
+from structures import CellSet, Stack
 
 class DepthFirstSearch():
-    def __init__(self, filename):
-        with open(filename) as f:
-            lines = f.read()
-
-        if lines.count("A") != 1:
-            raise Exception("Error! Maze has no start nodes or has more than 1 start nodes")
-        if lines.count("B") != 1:
-            raise Exception("Error! Maze has no end nodes or has more than 1 end nodes")
-
-        # Determine height and width of maze
-        lines = lines.splitlines()
-        # print(lines)
-        self.height = len(lines)
-        self.width = max(len(line) for line in lines)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if lines[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif lines[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif lines[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+    # Prefix of the image files written by output_image
+    image_name = "DFS"
+
+    def __init__(self, maze):
+
+        # Load the maze, unless an already parsed one was passed in
+        self.maze = load_maze(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        self.walls = self.maze.walls
+        self.start = self.maze.start
+        self.goal = self.maze.goal
         self.solution = None
 
     def print(self):
         solution = self.solution[1] if self.solution is not None else None
         print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+        for i in range(self.height):
+            for j in range(self.width):
+                col = self.walls[i * self.width + j]
                 if col:
                     print("█", end="")
                 elif (i, j) == self.start:
@@ -59,121 +39,70 @@ class DepthFirstSearch():
         print()
 
     def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
+        return self.maze.neighbors(state)
 
     def solve(self):
-        # Keep track of number of states explored
-        self.num_explored = 0
-        self.path_length = 0
-        self.time_taken = 0
-        startTime = dt.datetime.now()
+        # Keep track of the search metrics, see metrics.py
+        self.solution = None
+        num_explored = max_frontier = 0
+        num_generated = 1
+        start_time = time.perf_counter_ns()
+
+        check_connected(self, start_time)
+
+        # Search over integer cell ids, using the maze's precomputed neighbor table
+        table = self.maze.neighbor_table()
+        moves = self.maze.moves
+        goal = self.maze.cell(self.goal)
+
+        # Parents of reached cells are kept in a flat search tree
+        size = self.height * self.width
+        tree = SearchTree(size)
 
         # Initialize nodelist to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        nodelist = Stack()
+        start = self.maze.cell(self.start)
+        nodelist = Stack(size)
         nodelist.add(start)
 
         # Initialize an empty explored set
-        self.explored = set()
+        self.explored = CellSet(size)
 
         # Keep looping until solution found
         while True:
             # If nothing left in nodelist, then no path
             if nodelist.empty():
+                record_result(self, start_time, num_explored, num_generated, max_frontier)
                 raise Exception("no solution")
+            if len(nodelist) > max_frontier:
+                max_frontier = len(nodelist)
             
             # Choose a node from the nodelist
             node = nodelist.remove()
 
             # If node is the goal, then we have a solution
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                endTime = time.time()
-                self.time_taken = endTime - startTime
-                return
+            if node == goal:
+                actions, cells = tree.path(node)
+                self.solution = (actions, [self.maze.state(cell) for cell in cells])
+                return record_result(self, start_time, num_explored, num_generated, max_frontier)
 
             # Mark node as explored
-            self.explored.add(node.state)
+            self.explored.add(node)
+            num_explored += 1
 
             # Add neighbors to nodelist
-            for action, state in self.neighbors(node.state):
+            for action, offset in moves[table[node]]:
+                state = node + offset
                 if not nodelist.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    nodelist.add(child)
+                    tree.add(state, node, action)
+                    nodelist.add(state)
+                    num_generated += 1
             
     
     def output_image(self, show_solution=True, show_explored=False):
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-                    self.num_explored += 1
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-                    self.num_explored += 1
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (249, 97, 103)
-                    self.num_explored += 1
-                    self.path_length += 1
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (252,252,125)
-                    self.num_explored += 1
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        if(show_explored):
-            img.save("images/DFS.png")
+        # Imported here so that solving without images never loads NumPy and PIL
+        from render import render
+        if (show_explored):
+            filename = "images/%s.png" % self.image_name
         else:
-            img.save("images/DFS-noexplored.png")
\ No newline at end of file
+            filename = "images/%s-noexplored.png" % self.image_name
+        render(self.maze, filename, self.solution, self.explored, show_solution, show_explored)
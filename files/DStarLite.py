@@ -0,0 +1,179 @@
+import time
+from array import array
+from AStar import A_star_Search
+from heuristics import MAZE_HEURISTICS
+from maze import ACTIONS, load_maze
+from metrics import check_connected, record_result
+from structures import CellSet, PriorityQueue
+
+
+class D_star_Lite_Search(A_star_Search):
+    """D* Lite, which repairs its last search when walls change or the start moves.
+
+    The search runs backwards from the goal, keeping g, the distance to the
+    goal of every cell it settled, and rhs, the distance one step further
+    through the best neighbor. Cells where the two differ are queued, ordered
+    like A* towards the start. After set_wall or move_start, the next solve()
+    only requeues the cells next to what changed, and expands just those
+    whose distance to the goal is affected, instead of searching from scratch.
+
+    The walls are changed on a copy of the maze, so that other solvers sharing
+    it are not affected. Only the first search checks the components of the
+    maze like the other solvers, as after a change they would have to be
+    labeled again.
+    """
+    image_name = "D-star-Lite"
+
+    def __init__(self, maze, heuristic="manhattan"):
+        # The heuristic is measured from the start, which moves, on walls that
+        # change, so it cannot be one worked out from the maze
+        if heuristic in MAZE_HEURISTICS:
+            raise Exception("D* Lite needs a heuristic that does not depend on the walls, not %r" % heuristic)
+        super().__init__(load_maze(maze).copy(), heuristic)
+
+        # Distances to the goal, set up by the first solve()
+        self.goal_cell = self.maze.cell(self.goal)
+        self.g = None
+        self.rhs = None
+        self.queue = None
+        # Added to every key, so that the keys queued before the start moved stay lower bounds
+        self.key_modifier = 0
+        self.last_start = self.start
+        # Cells whose walls changed since the last solve()
+        self.changed = []
+
+    def set_wall(self, state, wall=True):
+        """Puts a wall on state, or opens it if wall is false, for the next solve() to take into account."""
+        if not self.maze.contains(state):
+            raise Exception("state %r is outside the maze" % (state,))
+        if self.maze.is_wall(state) != bool(wall):
+            self.maze.set_wall(state, wall)
+            self.changed.append(self.maze.cell(state))
+
+    def toggle_wall(self, state):
+        if not self.maze.contains(state):
+            raise Exception("state %r is outside the maze" % (state,))
+        self.set_wall(state, not self.maze.is_wall(state))
+
+    def move_start(self, state):
+        """Makes state the start of the next solve(), like an agent walking along the solution."""
+        if not self.maze.contains(state) or self.maze.is_wall(state):
+            raise Exception("start %r is not an open cell of the maze" % (state,))
+        self.start = self.maze.start = state
+
+    def key(self, cell):
+        """Returns the queue priority of cell, lowest first."""
+        distance = min(self.g[cell], self.rhs[cell])
+        return (distance + self.h(self.maze.state(cell), self.start) + self.key_modifier, distance)
+
+    def update(self, cell):
+        """Works out rhs of cell again, and queues cell if it differs from g. Returns whether it was queued."""
+        if cell != self.goal_cell:
+            table = self.maze.neighbor_table()
+            rhs = float("inf")
+            for action, offset in self.maze.moves[table[cell]]:
+                if self.g[cell + offset] + 1 < rhs:
+                    rhs = self.g[cell + offset] + 1
+            self.rhs[cell] = rhs
+        if self.g[cell] != self.rhs[cell]:
+            self.queue.add(cell, self.key(cell))
+            return True
+        self.queue.discard(cell)
+        return False
+
+    def solve(self):
+        # Keep track of the search metrics, see metrics.py. Only the work of this
+        # call is counted, so a repair shows how much it took
+        self.solution = None
+        num_explored = max_frontier = 0
+        num_generated = 0
+        start_time = time.perf_counter_ns()
+        size = self.height * self.width
+        self.explored = CellSet(size)
+
+        table = self.maze.neighbor_table()
+        moves = self.maze.moves
+        start = self.maze.cell(self.start)
+
+        if self.g is None:
+            check_connected(self, start_time)
+
+            # Start from the goal, the only cell with a known distance
+            self.g = array("d", [float("inf")]) * size
+            self.rhs = array("d", [float("inf")]) * size
+            self.rhs[self.goal_cell] = 0
+            self.queue = PriorityQueue()
+            self.queue.add(self.goal_cell, self.key(self.goal_cell))
+            num_generated += 1
+            self.changed = []
+        else:
+            # Keys queued before the start moved were measured from the old start, at most
+            # h(old start, new start) more than they should be; raising every key from now
+            # on by as much keeps the queued ones in order without recomputing them
+            if self.start != self.last_start:
+                self.key_modifier += self.h(self.last_start, self.start)
+
+            # New walls lose their distance at once, their neighbors and new open cells
+            # find theirs again from the cells around them
+            for cell in self.changed:
+                if self.walls[cell]:
+                    self.g[cell] = self.rhs[cell] = float("inf")
+                    self.queue.discard(cell)
+                else:
+                    num_generated += self.update(cell)
+                for action, offset in moves[15]:
+                    neighbor = cell + offset
+                    if 0 <= neighbor < size and (action < 2 or neighbor // self.width == cell // self.width):
+                        if not self.walls[neighbor]:
+                            num_generated += self.update(neighbor)
+            self.changed = []
+        self.last_start = self.start
+
+        # Expand cells until the start's distance is settled and nothing queued could lower it
+        queue, g, rhs = self.queue, self.g, self.rhs
+        while not queue.empty() and (queue.top_priority() < self.key(start) or rhs[start] != g[start]):
+            if len(queue) > max_frontier:
+                max_frontier = len(queue)
+            old_key = queue.top_priority()
+            node = queue.remove()
+            new_key = self.key(node)
+            if old_key < new_key:
+                queue.add(node, new_key)
+                continue
+
+            self.explored.add(node)
+            num_explored += 1
+            if g[node] > rhs[node]:
+                # The distance fell, which may give the neighbors a shorter way through node
+                g[node] = rhs[node]
+                for action, offset in moves[table[node]]:
+                    state = node + offset
+                    if state != self.goal_cell and g[node] + 1 < rhs[state]:
+                        rhs[state] = g[node] + 1
+                    if g[state] != rhs[state]:
+                        queue.add(state, self.key(state))
+                        num_generated += 1
+                    else:
+                        queue.discard(state)
+            else:
+                # The distance rose, so node and the neighbors that went through it look again
+                g[node] = float("inf")
+                num_generated += self.update(node)
+                for action, offset in moves[table[node]]:
+                    num_generated += self.update(node + offset)
+
+        if g[start] == float("inf"):
+            record_result(self, start_time, num_explored, num_generated, max_frontier)
+            raise Exception("no solution")
+
+        # Walk from the start, each time to the neighbor closest to the goal
+        actions = []
+        cells = []
+        cell = start
+        while cell != self.goal_cell:
+            action, offset = min(moves[table[cell]], key=lambda move: g[cell + move[1]])
+            cell += offset
+            actions.append(ACTIONS[action])
+            cells.append(self.maze.state(cell))
+        self.solution = (actions, cells)
+        return record_result(self, start_time, num_explored, num_generated, max_frontier)
@@ -1,71 +1,37 @@
-import numpy as np
-import datetime as dt
-from node import Node
-from PIL import Image, ImageDraw
+import time
+from heuristics import get_heuristic
+from maze import load_maze
+from metrics import check_connected, record_result
+from node import SearchTree
+from structures import CellSet, PriorityQueue
 
 
 class GreedyBestFirstSearch():
-    def __init__(self, filename):
-
-        # Read file and set height and width of maze
-        with open(filename) as f:
-            lines = f.read()
-
-        # Validate start and goal
-        if lines.count("A") != 1:
-            raise Exception("maze must have exactly one start point")
-        if lines.count("B") != 1:
-            raise Exception("maze must have exactly one goal")
-
-        # Determine height and width of maze
-        lines = lines.splitlines()
-        # for line in lines:
-        # print(line)
-        self.height = len(lines)
-        self.width = max(len(line) for line in lines)
-        # print(self.height," ",self.width)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if lines[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif lines[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif lines[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+    # Prefix of the image files written by output_image
+    image_name = "GBFS"
+
+    def __init__(self, maze, heuristic="manhattan"):
+
+        # Load the maze, unless an already parsed one was passed in
+        self.maze = load_maze(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        self.walls = self.maze.walls
+        self.start = self.maze.start
+        self.goal = self.maze.goal
 
         self.solution = None
-        x_g, y_g = self.goal
-        # print(x_g,y_g)
-        self.heuristic = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                if not self.walls[i][j]:
-                    if self.walls[i][j] == 'B':
-                        row.append(0)
-                    else:
-                        row.append(abs(x_g-i) + abs(y_g-j))
-                else:
-                    row.append('X')
-            self.heuristic.append(row)
+
+        # Heuristic estimate of the remaining path cost, see heuristics.py. The
+        # search only evaluates it for the cells it generates
+        self.h = get_heuristic(heuristic, self.maze)
 
     def print(self):
         solution = self.solution[1] if self.solution is not None else None
         print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+        for i in range(self.height):
+            for j in range(self.width):
+                col = self.walls[i * self.width + j]
                 if col:
                     print("█", end="")
                 elif (i, j) == self.start:
@@ -84,137 +50,65 @@ class GreedyBestFirstSearch():
         # print(self.heuristic)
 
     def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
+        return self.maze.neighbors(state)
 
     def solve(self):
-        # Initialize self.frontier priority queue and explored set
-        self.num_explored = 0
-        self.time_taken = 0
-        self.path_length = 0
+        # Keep track of the search metrics, see metrics.py
+        self.solution = None
+        num_explored = max_frontier = 0
+        num_generated = 1
+        start_time = time.perf_counter_ns()
 
-        startTime = dt.datetime.now()
-        # Initialise the start node
-        start_node = Node(state=self.start, parent=None, action=None)
-        x_c, y_c = self.start
+        check_connected(self, start_time)
 
-        # initialise the self.frontier dict, keys are nodes, and values are the heuristic at that node
-        self.frontier = {}
-        self.frontier[start_node] = self.heuristic[x_c][y_c]
+        # Search over integer cell ids, using the maze's precomputed neighbor table
+        table = self.maze.neighbor_table()
+        moves = self.maze.moves
+        goal = self.maze.cell(self.goal)
+
+        # Parents of reached cells are kept in a flat search tree
+        size = self.height * self.width
+        tree = SearchTree(size)
+
+        # Initialise the start node
+        start = self.maze.cell(self.start)
+        h = self.h(self.start, self.goal)
 
-        # maintain a track of states and nodes in the maze
-        self.nodelist = {}
-        self.nodelist[start_node.state] = start_node
+        # initialise the frontier priority queue, ordered by the heuristic at each node
+        frontier = PriorityQueue()
+        frontier.add(start, h)
 
         # initialise explored set
-        self.explored = set()
+        self.explored = CellSet(size)
 
         # search till solution found or no more states left to explore
         while True:
-            if (len(self.frontier) == 0):
+            if frontier.empty():
+                record_result(self, start_time, num_explored, num_generated, max_frontier)
                 raise Exception("no solution")
-            self.frontier_keys = list(self.frontier.keys())
-            self.frontier_vals = list(self.frontier.values())
-            sorted_value_index = np.argsort(self.frontier_vals)[::-1]
-            # sorted_value_index.reverse()
-            self.frontier = {
-                self.frontier_keys[i]: self.frontier_vals[i] for i in sorted_value_index}
-            node, node_heuristic = self.frontier.popitem()
-
-            if (node.state == self.goal):
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                endTime = dt.datetime.now()
-                self.time_taken = endTime - startTime
-                return
-
-            self.explored.add(node.state)
-            for action, state in self.neighbors(node.state):
-                if not self.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    x_t, y_t = child.state
-                    self.frontier[child] = self.heuristic[x_t][y_t]
-
-    def contains_state(self, state):
-        try:
-            if (self.frontier[self.nodelist[state]] in self.frontier.keys):
-                return True
-        except KeyError:
-            return False
+            if len(frontier) > max_frontier:
+                max_frontier = len(frontier)
+            node = frontier.remove()
+
+            if node == goal:
+                actions, cells = tree.path(node)
+                self.solution = (actions, [self.maze.state(cell) for cell in cells])
+                return record_result(self, start_time, num_explored, num_generated, max_frontier)
+
+            self.explored.add(node)
+            num_explored += 1
+            for action, offset in moves[table[node]]:
+                state = node + offset
+                if not frontier.contains_state(state) and state not in self.explored:
+                    tree.add(state, node, action)
+                    frontier.add(state, self.h(self.maze.state(state), self.goal))
+                    num_generated += 1
 
     def output_image(self, show_solution=True, show_explored=False):
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-                    self.num_explored += 1
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-                    self.num_explored += 1
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (249, 97, 103)
-                    self.num_explored += 1
-                    self.path_length += 1
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (252, 252, 125)
-                    self.num_explored += 1
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-                draw.text((((j * cell_size + cell_border + (j + 1) * cell_size - cell_border)/2, (i * cell_size +
-                          cell_border + (i + 1) * cell_size - cell_border)/2)), str(self.heuristic[i][j]), fill="black")
-
+        # Imported here so that solving without images never loads NumPy and PIL
+        from render import render
         if (show_explored):
-            img.save("images/GBFS.png")
+            filename = "images/%s.png" % self.image_name
         else:
-            img.save("images/GBFS-noexplored.png")
+            filename = "images/%s-noexplored.png" % self.image_name
+        render(self.maze, filename, self.solution, self.explored, show_solution, show_explored)
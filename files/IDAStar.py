@@ -0,0 +1,133 @@
+import time
+from AStar import A_star_Search
+from cache import LRUCache
+from maze import ACTIONS
+from metrics import check_connected, record_result
+from structures import CellSet
+
+
+class IDA_star_Search(A_star_Search):
+    """Iterative deepening A*, which needs memory only in proportion to the path depth.
+
+    Besides the maze itself, the search keeps the current path, at about 130
+    bytes a step, and the transposition table, at about 200 bytes an entry or
+    13 MB when full at the default size, however large the maze. It never
+    builds the maze's neighbor table, which takes a byte per cell, and works
+    out the moves from each cell from the walls instead.
+
+    Each iteration is a depth first search that cuts off every path whose
+    f = g + h exceeds a bound, starting from h at the start and raised each
+    time to the smallest f that was cut off, so the first solution found is
+    optimal for an admissible heuristic. Cells are re-expanded across and
+    within iterations, trading time for memory.
+
+    Cells already on the current path are never revisited. Besides that, a
+    transposition table of at most transposition_size cells remembers the
+    cheapest cost each cell was reached at in the current iteration, to prune
+    costlier paths to it; 0 turns it off. The explored set is only kept if
+    track_explored is set, as it takes a bit per cell of the maze.
+    """
+    image_name = "IDA-star"
+
+    def __init__(self, maze, heuristic="manhattan", transposition_size=2 ** 16, track_explored=False):
+        super().__init__(maze, heuristic)
+        self.transposition_size = transposition_size
+        self.track_explored = track_explored
+
+    def solve(self):
+        # Keep track of the search metrics, see metrics.py. The frontier of a
+        # depth first search is the current path
+        self.solution = None
+        num_explored = max_frontier = 0
+        num_generated = 1
+        start_time = time.perf_counter_ns()
+        self.explored = CellSet(self.height * self.width) if self.track_explored else None
+
+        check_connected(self, start_time)
+
+        # Search over integer cell ids
+        start = self.maze.cell(self.start)
+        goal = self.maze.cell(self.goal)
+        table_size = self.transposition_size
+        transpositions = LRUCache(table_size, sizeof=lambda cost: 1) if table_size else None
+
+        bound = self.h(self.start, self.goal)
+        while True:
+            # The path as a list of cells, the actions between them, the moves from
+            # each cell, the index of the next one to try, and the cells as a set
+            path = [start]
+            actions = []
+            options = [self.open_moves(start)]
+            tried = [0]
+            on_path = {start}
+            if transpositions is not None:
+                transpositions.clear()
+            next_bound = float("inf")
+
+            while path:
+                node = path[-1]
+                i = tried[-1]
+                if i == 0:
+                    num_explored += 1
+                    if self.explored is not None:
+                        self.explored.add(node)
+
+                # Back up once every move from node has been tried
+                if i == len(options[-1]):
+                    path.pop()
+                    options.pop()
+                    tried.pop()
+                    on_path.discard(node)
+                    if actions:
+                        actions.pop()
+                    continue
+                tried[-1] = i + 1
+
+                action, offset = options[-1][i]
+                state = node + offset
+                if state in on_path:
+                    continue
+                cost = len(path)
+                f = cost + self.h(self.maze.state(state), self.goal)
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    continue
+                if transpositions is not None:
+                    seen = transpositions.get(state)
+                    if seen is not None and seen <= cost:
+                        continue
+                    transpositions.put(state, cost)
+
+                path.append(state)
+                actions.append(action)
+                options.append(self.open_moves(state))
+                tried.append(0)
+                on_path.add(state)
+                num_generated += 1
+                if len(path) > max_frontier:
+                    max_frontier = len(path)
+
+                if state == goal:
+                    self.solution = ([ACTIONS[a] for a in actions], [self.maze.state(cell) for cell in path[1:]])
+                    return record_result(self, start_time, num_explored, num_generated, max_frontier)
+
+            # Nothing was cut off, so every reachable path has been tried
+            if next_bound == float("inf"):
+                record_result(self, start_time, num_explored, num_generated, max_frontier)
+                raise Exception("no solution")
+            bound = next_bound
+
+    def open_moves(self, cell):
+        """Returns the (index into ACTIONS, offset) pairs of the moves from cell to open cells, read from the walls."""
+        walls, width = self.walls, self.width
+        row, col = divmod(cell, width)
+        mask = 0
+        if row > 0 and not walls[cell - width]:
+            mask |= 1
+        if row < self.height - 1 and not walls[cell + width]:
+            mask |= 2
+        if col > 0 and not walls[cell - 1]:
+            mask |= 4
+        if col < width - 1 and not walls[cell + 1]:
+            mask |= 8
+        return self.maze.moves[mask]
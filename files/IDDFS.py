@@ -0,0 +1,15 @@
+from IDAStar import IDA_star_Search
+
+
+class IterativeDeepeningSearch(IDA_star_Search):
+    """Iterative deepening depth first search, with memory in proportion to the path depth.
+
+    Depth first searches limited to depth 0, 1, 2 and so on are run until one
+    reaches the goal, which is IDA* with a heuristic of zero, so the solutions
+    found are shortest. See IDA_star_Search for transposition_size and
+    track_explored.
+    """
+    image_name = "IDDFS"
+
+    def __init__(self, maze, transposition_size=2 ** 16, track_explored=False):
+        super().__init__(maze, "zero", transposition_size, track_explored)
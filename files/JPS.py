@@ -0,0 +1,159 @@
+import time
+from array import array
+from AStar import A_star_Search
+from maze import ACTIONS
+from metrics import check_connected, record_result
+from node import SearchTree
+from structures import CellSet, PriorityQueue
+
+UP, DOWN, LEFT, RIGHT = range(4)
+
+
+class JumpPointSearch(A_star_Search):
+    """A* over jump points of a uniform-cost 4-connected grid.
+
+    Paths are taken in a canonical order: a vertical move may be followed by
+    any move but the reverse, while a horizontal move is only followed by the
+    same move unless a wall forces a turn. Runs of cells with no choice to
+    make are skipped in one jump, so only cells where the path may bend are
+    put on the frontier. The solutions are optimal, like those of A*.
+    """
+    image_name = "JPS"
+
+    def jump_horizontal(self, cell, action):
+        """Returns the first jump point left or right of cell, or None if there is none."""
+        walls, width, height = self.walls, self.width, self.height
+        step = 1 if action == RIGHT else -1
+        row, col = divmod(cell, width)
+        while True:
+            col += step
+            cell += step
+            if col < 0 or col >= width or walls[cell]:
+                return None
+            if cell == self.goal_cell:
+                return cell
+
+            # A cell above or below is forced if the cell behind it is a wall,
+            # since it cannot then be reached by turning earlier
+            if row > 0 and not walls[cell - width] and walls[cell - width - step]:
+                return cell
+            if row < height - 1 and not walls[cell + width] and walls[cell + width - step]:
+                return cell
+
+    def jump_vertical(self, cell, action):
+        """Returns the first jump point above or below cell, or None if there is none."""
+        walls, width, height = self.walls, self.width, self.height
+        step = width if action == DOWN else -width
+        row = cell // width
+        while True:
+            row += 1 if action == DOWN else -1
+            cell += step
+            if row < 0 or row >= height or walls[cell]:
+                return None
+            if cell == self.goal_cell:
+                return cell
+
+            # Vertical moves may turn at any cell, so a cell is a jump point
+            # whenever there is a jump point to its left or right
+            if self.jump_horizontal(cell, LEFT) is not None or self.jump_horizontal(cell, RIGHT) is not None:
+                return cell
+
+    def successors(self, cell, action):
+        """Returns the (action, jump point) pairs reached from cell, entered by action."""
+        width = self.width
+        if action is None:
+            directions = (UP, DOWN, LEFT, RIGHT)
+        elif action in (UP, DOWN):
+            directions = (action, LEFT, RIGHT)
+        else:
+            # Continue straight, and turn only towards forced cells
+            step = 1 if action == RIGHT else -1
+            row = cell // width
+            directions = [action]
+            if row > 0 and not self.walls[cell - width] and self.walls[cell - width - step]:
+                directions.append(UP)
+            if row < self.height - 1 and not self.walls[cell + width] and self.walls[cell + width - step]:
+                directions.append(DOWN)
+
+        result = []
+        for direction in directions:
+            if direction in (UP, DOWN):
+                jump = self.jump_vertical(cell, direction)
+            else:
+                jump = self.jump_horizontal(cell, direction)
+            if jump is not None:
+                result.append((direction, jump))
+        return result
+
+    def solve(self):
+        # Keep track of the search metrics, see metrics.py
+        self.solution = None
+        num_explored = max_frontier = 0
+        num_generated = 1
+        start_time = time.perf_counter_ns()
+
+        check_connected(self, start_time)
+
+        size = self.height * self.width
+        start = self.maze.cell(self.start)
+        self.goal_cell = self.maze.cell(self.goal)
+
+        # Parents of reached jump points are kept in a flat search tree, with
+        # the direction of the jump that reached them as the action
+        tree = SearchTree(size)
+
+        # Cost of the cheapest path found so far to each jump point, -1 if none
+        self.cost = array(tree.parents.typecode, [-1]) * size
+        self.cost[start] = 0
+
+        # initialise the frontier priority queue, ordered by f = g + h
+        h = self.h(self.start, self.goal)
+        frontier = PriorityQueue()
+        frontier.add(start, (h, h))
+
+        # initialise explored set
+        self.explored = CellSet(size)
+
+        # search till solution found or no more jump points left to explore
+        while True:
+            if frontier.empty():
+                record_result(self, start_time, num_explored, num_generated, max_frontier)
+                raise Exception("no solution")
+            if len(frontier) > max_frontier:
+                max_frontier = len(frontier)
+            node = frontier.remove()
+
+            if node == self.goal_cell:
+                self.solution = self.walk(tree, node)
+                return record_result(self, start_time, num_explored, num_generated, max_frontier)
+
+            self.explored.add(node)
+            num_explored += 1
+            action = tree.actions[node] if node != start else None
+            row, col = divmod(node, self.width)
+            for direction, jump in self.successors(node, action):
+                # Jumps are straight, so their cost is the distance travelled
+                jump_row, jump_col = divmod(jump, self.width)
+                cost = self.cost[node] + abs(jump_row - row) + abs(jump_col - col)
+                if self.cost[jump] == -1 or cost < self.cost[jump]:
+                    self.cost[jump] = cost
+                    self.explored.discard(jump)
+                    tree.add(jump, node, direction)
+                    h = self.h((jump_row, jump_col), self.goal)
+                    frontier.add(jump, (cost + h, h))
+                    num_generated += 1
+
+    def walk(self, tree, cell):
+        """Returns the solution reaching cell, with every jump expanded into single moves."""
+        offsets = (-self.width, self.width, -1, 1)
+        jump_actions, jump_cells = tree.path(cell)
+        actions = []
+        cells = []
+        cell = self.maze.cell(self.start)
+        for action, jump in zip(jump_actions, jump_cells):
+            step = offsets[ACTIONS.index(action)]
+            while cell != jump:
+                cell += step
+                actions.append(action)
+                cells.append(self.maze.state(cell))
+        return (actions, cells)
@@ -0,0 +1,94 @@
+import time
+from BFS import BreadthFirstSearch
+from maze import ACTIONS
+from metrics import check_connected, record_result
+from structures import CellSet
+
+
+class WavefrontBreadthFirstSearch(BreadthFirstSearch):
+    """Breadth first search that expands a whole layer at a time with NumPy.
+
+    The frontier is an array of cell ids. Each step looks up the open moves of
+    every frontier cell in the neighbor table at once, keeps the unreached
+    cells they lead to as the next layer and stores their distance from the
+    start, until the goal is reached. The solution is then traced back from
+    the goal through cells one step closer each time, so it is a shortest
+    path like that of BreadthFirstSearch, though possibly a different one.
+    Afterwards self.distances holds the distance of every reached cell, and
+    -1 for the others.
+    """
+    image_name = "BFS-wavefront"
+
+    def solve(self):
+        # Keep track of the search metrics, see metrics.py
+        self.solution = None
+        num_explored = max_frontier = 0
+        num_generated = 1
+        start_time = time.perf_counter_ns()
+
+        check_connected(self, start_time)
+
+        # NumPy is only loaded when this solver is used
+        import numpy as np
+
+        size = self.height * self.width
+        table = np.frombuffer(self.maze.neighbor_table(), dtype=np.uint8)
+        offsets = [offset for action, offset in self.maze.moves[15]]
+        start = self.maze.cell(self.start)
+        goal = self.maze.cell(self.goal)
+
+        distances = np.full(size, -1, dtype=np.int32 if size < 2 ** 31 else np.int64)
+        distances[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+        depth = 0
+        while distances[goal] == -1:
+            if not len(frontier):
+                break
+            num_explored += len(frontier)
+            if len(frontier) > max_frontier:
+                max_frontier = len(frontier)
+
+            # Cells reached by each of the four moves, in the order of ACTIONS,
+            # minus those already reached and cells reached twice
+            masks = table[frontier]
+            reached = np.concatenate([frontier[(masks >> i) & 1 == 1] + offset for i, offset in enumerate(offsets)])
+            frontier = np.unique(reached[distances[reached] == -1])
+            depth += 1
+            distances[frontier] = depth
+            num_generated += len(frontier)
+
+        self.distances = distances.reshape(self.height, self.width)
+
+        # Every layer before the goal's was expanded
+        expanded = (distances >= 0) & (distances < depth)
+        self.explored = CellSet(size)
+        self.explored.bits[:] = np.packbits(expanded, bitorder="little").tobytes()
+        self.explored.count = int(num_explored)
+
+        if distances[goal] == -1:
+            record_result(self, start_time, num_explored, num_generated, max_frontier)
+            raise Exception("no solution")
+
+        self.solution = self.trace(distances, goal)
+        return record_result(self, start_time, num_explored, num_generated, max_frontier)
+
+    def trace(self, distances, goal):
+        """Returns the solution reaching goal, stepping back to a cell one closer to the start each time."""
+        table = self.maze.neighbor_table()
+        moves = self.maze.moves
+        actions = []
+        cells = []
+        cell = goal
+        distance = int(distances[goal])
+        while distance > 0:
+            for action, offset in moves[table[cell]]:
+                if distances[cell + offset] == distance - 1:
+                    # Moves pair up with their opposites in ACTIONS, so action ^ 1 leads back to cell
+                    actions.append(ACTIONS[action ^ 1])
+                    cells.append(self.maze.state(cell))
+                    cell += offset
+                    distance -= 1
+                    break
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
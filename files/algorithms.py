@@ -0,0 +1,30 @@
+from AStar import A_star_Search
+from BFS import BreadthFirstSearch
+from BiAStar import Bidirectional_A_star_Search
+from BiBFS import BidirectionalBreadthFirstSearch
+from DStarLite import D_star_Lite_Search
+from DFS import DepthFirstSearch
+from GBFS import GreedyBestFirstSearch
+from IDAStar import IDA_star_Search
+from IDDFS import IterativeDeepeningSearch
+from JPS import JumpPointSearch
+from WavefrontBFS import WavefrontBreadthFirstSearch
+
+# Solvers by the name used to select them on the command line, with the
+# title used when printing their results
+ALGORITHMS = {
+    "bfs": ("Breadth First Search", BreadthFirstSearch),
+    "dfs": ("Depth First Search", DepthFirstSearch),
+    "gbfs": ("Greedy Best First Search", GreedyBestFirstSearch),
+    "astar": ("A* Search", A_star_Search),
+    "bibfs": ("Bidirectional Breadth First Search", BidirectionalBreadthFirstSearch),
+    "biastar": ("Bidirectional A* Search", Bidirectional_A_star_Search),
+    "jps": ("Jump Point Search", JumpPointSearch),
+    "iddfs": ("Iterative Deepening Depth First Search", IterativeDeepeningSearch),
+    "idastar": ("IDA* Search", IDA_star_Search),
+    "wavefront": ("Wavefront Breadth First Search", WavefrontBreadthFirstSearch),
+    "dstarlite": ("D* Lite Search", D_star_Lite_Search)
+}
+
+# The algorithms run when none are selected
+DEFAULT_ALGORITHMS = ["bfs", "dfs", "gbfs", "astar"]
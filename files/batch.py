@@ -0,0 +1,93 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from algorithms import ALGORITHMS, DEFAULT_ALGORITHMS
+from maze import Maze
+
+
+def maze_files(pattern):
+    """Returns the text and binary maze files in a directory, or the files matching a glob pattern, sorted."""
+    if os.path.isdir(pattern):
+        return sorted(glob.glob(os.path.join(pattern, "*.txt")) + glob.glob(os.path.join(pattern, "*.maze")))
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def solve_files(filenames, algorithms, include_paths=False, precheck=False):
+    """Solves every maze file with every algorithm and returns one record per pair.
+
+    Runs in a worker process, parsing each file once for all of the algorithms.
+    Errors are recorded rather than raised, so one bad file does not sink its chunk.
+    With precheck, each maze is labeled into components before it is solved, see
+    Maze.maybe_connected.
+    """
+    records = []
+    for filename in filenames:
+        try:
+            maze = Maze.from_file(filename)
+            if precheck:
+                maze.components()
+        except Exception as e:
+            records.append({"file": filename, "error": str(e)})
+            continue
+        for name in algorithms:
+            solver = ALGORITHMS[name][1](maze)
+            record = {"file": filename, "algorithm": name}
+            try:
+                solver.solve()
+            except Exception as e:
+                if str(e) != "no solution":
+                    record["error"] = str(e)
+                    records.append(record)
+                    continue
+            record.update(solver.result.as_dict(), algorithm=name)
+            if include_paths and solver.solution is not None:
+                record["path"] = solver.solution[1]
+            records.append(record)
+    return records
+
+
+def run_batch(filenames, algorithms, output, workers=None, chunksize=8, include_paths=False, precheck=False):
+    """Solves the files over a process pool, writing JSON lines to output as chunks complete.
+
+    Returns the number of records written.
+    """
+    chunks = [filenames[i:i + chunksize] for i in range(0, len(filenames), chunksize)]
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(solve_files, chunk, algorithms, include_paths, precheck) for chunk in chunks]
+        for future in as_completed(futures):
+            for record in future.result():
+                output.write(json.dumps(record) + "\n")
+                written += 1
+            output.flush()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many maze files in parallel.")
+    parser.add_argument("mazes", help="directory of .txt and .maze mazes, or a glob pattern such as 'mazes/**/*.txt'")
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, one per core by default")
+    parser.add_argument("--chunksize", type=int, default=8, help="maze files handed to a worker at a time")
+    parser.add_argument("--output", help="JSON lines file to write, standard output by default")
+    parser.add_argument("--paths", action="store_true", help="include the solution cells in each record")
+    parser.add_argument("--precheck", action="store_true", help="label each maze's components first, so that unsolvable mazes are answered at once")
+    args = parser.parse_args()
+
+    filenames = maze_files(args.mazes)
+    if not filenames:
+        sys.exit("No maze files match %s" % args.mazes)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            written = run_batch(filenames, args.algorithms, output, args.workers, args.chunksize, args.paths, args.precheck)
+    else:
+        written = run_batch(filenames, args.algorithms, sys.stdout, args.workers, args.chunksize, args.paths, args.precheck)
+    print("Processed %d maze files, %d results" % (len(filenames), written), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
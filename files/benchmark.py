@@ -0,0 +1,134 @@
+import argparse
+import csv
+import json
+import statistics
+import sys
+import tracemalloc
+from algorithms import ALGORITHMS, DEFAULT_ALGORITHMS
+from maze_generator import GENERATORS, random_maze
+
+# Columns of the report, in CSV order
+FIELDS = [
+    "size", "density", "maze", "algorithm", "solved", "path_length", "shortest_path", "path_ratio",
+    "num_explored", "num_generated", "max_frontier", "time_ms_min", "time_ms_median",
+    "nodes_per_sec", "peak_memory_bytes"
+]
+
+
+def run(solver_class, maze):
+    """Solves maze with a new solver and returns its SearchResult, unsolvable or not."""
+    solver = solver_class(maze)
+    try:
+        solver.solve()
+    except Exception as e:
+        if str(e) != "no solution":
+            raise
+    return solver.result
+
+
+def benchmark(sizes, densities, algorithms, mazes=1, repeat=3, warmup=1, seed=0, generator="open"):
+    """Runs every algorithm on seeded random mazes and returns one report row per maze and algorithm."""
+    rows = []
+    for size in sizes:
+        for density in densities:
+            for index in range(mazes):
+                maze = random_maze(size, size, density, [seed, size, round(density * 1000000), index], generator)
+
+                # Shortest path length, to rate the paths the algorithms find
+                shortest = run(ALGORITHMS["bibfs"][1], maze)
+
+                for name in algorithms:
+                    solver_class = ALGORITHMS[name][1]
+                    for _ in range(warmup):
+                        run(solver_class, maze)
+                    results = [run(solver_class, maze) for _ in range(repeat)]
+
+                    # Peak memory comes from a separate run, as tracing slows the search
+                    tracemalloc.start()
+                    run(solver_class, maze)
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+
+                    result = results[0]
+                    times = [r.time_ns for r in results]
+                    rows.append({
+                        "size": size,
+                        "density": density,
+                        "maze": index,
+                        "algorithm": name,
+                        "solved": result.solved,
+                        "path_length": result.path_length,
+                        "shortest_path": shortest.path_length,
+                        "path_ratio": result.path_length / shortest.path_length if result.solved else None,
+                        "num_explored": result.num_explored,
+                        "num_generated": result.num_generated,
+                        "max_frontier": result.max_frontier,
+                        "time_ms_min": min(times) / 1e6,
+                        "time_ms_median": statistics.median(times) / 1e6,
+                        "nodes_per_sec": result.num_explored * 1e9 / max(statistics.median(times), 1),
+                        "peak_memory_bytes": peak
+                    })
+                    print("%5d %.2f #%d %-8s %10.3f ms %8d explored" % (
+                        size, density, index, name, rows[-1]["time_ms_median"], result.num_explored), file=sys.stderr)
+    return rows
+
+
+def compare(rows, baseline, tolerance):
+    """Returns a description of every row that is slower, hungrier or worse than its baseline row."""
+    key = lambda row: (row["size"], row["density"], row["maze"], row["algorithm"])
+    baseline = {key(row): row for row in baseline}
+    regressions = []
+    for row in rows:
+        base = baseline.get(key(row))
+        if base is None:
+            continue
+        label = "%s on %dx%d maze %d at density %s" % (row["algorithm"], row["size"], row["size"], row["maze"], row["density"])
+        for field in ("time_ms_median", "peak_memory_bytes"):
+            if row[field] > base[field] * (1 + tolerance):
+                regressions.append("%s: %s %.6g -> %.6g" % (label, field, base[field], row[field]))
+        if row["solved"] != base["solved"] or row["path_length"] > base["path_length"]:
+            regressions.append("%s: path_length %s -> %s" % (label, base["path_length"], row["path_length"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms on seeded random mazes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="side lengths of the square mazes")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.25], help="probabilities of a cell being a wall")
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--mazes", type=int, default=1, help="mazes generated per size and density")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per maze and algorithm")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before the timed ones")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--generator", default="open", choices=GENERATORS, help="maze generator, see maze_generator.py")
+    parser.add_argument("--json", help="write the report to this JSON file")
+    parser.add_argument("--csv", help="write the report to this CSV file")
+    parser.add_argument("--compare", help="JSON report to check this run against for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown before flagging a regression")
+    args = parser.parse_args()
+
+    rows = benchmark(args.sizes, args.densities, args.algorithms, args.mazes, args.repeat, args.warmup, args.seed, args.generator)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if not args.json and not args.csv:
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(rows, json.load(f), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION " + regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
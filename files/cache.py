@@ -0,0 +1,48 @@
+import sys
+from collections import OrderedDict
+
+
+class LRUCache():
+    """Mapping that keeps its most recently used entries, up to max_bytes in total.
+
+    The size of every value is measured once, with sizeof, when it is stored.
+    Storing an entry evicts the least recently used ones until the rest fit,
+    and a value larger than max_bytes on its own is not stored at all.
+    """
+
+    def __init__(self, max_bytes, sizeof=sys.getsizeof):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        # Entries as key: (value, size), least recently used first
+        self.entries = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key][0]
+
+    def put(self, key, value):
+        self.discard(key)
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        while self.nbytes + size > self.max_bytes:
+            self.nbytes -= self.entries.popitem(last=False)[1][1]
+        self.entries[key] = (value, size)
+        self.nbytes += size
+
+    def discard(self, key):
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,18 @@
+import argparse
+from maze import Maze
+
+# Converts mazes between the text and binary formats, see maze.py. The format
+# of the output follows its extension, .maze for binary and text otherwise
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a maze between the text and binary formats.")
+    parser.add_argument("input", help="text or binary maze file")
+    parser.add_argument("output", help="file to write, binary if it ends in .maze")
+    parser.add_argument("--packed", action="store_true", help="store a bit per cell in the binary file rather than a byte")
+    parser.add_argument("--no-neighbors", action="store_true", help="leave the neighbor table out of the binary file")
+    args = parser.parse_args()
+
+    maze = Maze.from_file(args.input)
+    if args.output.endswith(".maze"):
+        maze.to_binary(args.output, args.packed, not args.no_neighbors)
+    else:
+        maze.to_text(args.output)
@@ -0,0 +1,93 @@
+from array import array
+from collections import deque
+from cache import LRUCache
+
+
+# Heuristics estimate the remaining distance from state to goal. Manhattan
+# distance is exact on an empty 4-connected grid, Euclidean distance is a
+# weaker but still admissible estimate, and zero turns A* into Dijkstra's search.
+def manhattan(state, goal):
+    return abs(state[0] - goal[0]) + abs(state[1] - goal[1])
+
+
+def euclidean(state, goal):
+    return ((state[0] - goal[0]) ** 2 + (state[1] - goal[1]) ** 2) ** 0.5
+
+
+def zero(state, goal):
+    return 0
+
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "euclidean": euclidean,
+    "zero": zero,
+    "dijkstra": zero
+}
+
+# Distance fields computed so far, by maze digest and goal cell, see distance_field
+DISTANCE_FIELDS = LRUCache(256 * 2 ** 20)
+
+
+def distance_field(maze, goal):
+    """Returns the length of a shortest path from every cell of maze to goal, -1 where there is none.
+
+    The field is found with a breadth first search back from goal, and kept in
+    DISTANCE_FIELDS so that later searches towards the same goal of a maze
+    with the same walls get it for free.
+    """
+    goal = maze.cell(goal)
+    key = (maze.digest(), goal)
+    field = DISTANCE_FIELDS.get(key)
+    if field is None:
+        table = maze.neighbor_table()
+        moves = maze.moves
+        field = array("i" if maze.height * maze.width < 2 ** 31 else "q", [-1]) * (maze.height * maze.width)
+        field[goal] = 0
+        frontier = deque([goal])
+        while frontier:
+            cell = frontier.popleft()
+            distance = field[cell] + 1
+            for action, offset in moves[table[cell]]:
+                if field[cell + offset] == -1:
+                    field[cell + offset] = distance
+                    frontier.append(cell + offset)
+        DISTANCE_FIELDS.put(key, field)
+    return field
+
+
+def exact_distance(maze):
+    """Returns a heuristic giving the true distance to the goal in maze, from its distance fields.
+
+    The heuristic is perfect, so A* with it only expands cells on a shortest
+    path. Cells that cannot reach the goal get an infinite estimate.
+    """
+    fields = {}
+
+    def distance(state, goal):
+        field = fields.get(goal)
+        if field is None:
+            field = fields[goal] = distance_field(maze, goal)
+        d = field[state[0] * maze.width + state[1]]
+        return d if d != -1 else float("inf")
+    return distance
+
+
+# Heuristics that need the maze, by name, as functions of the maze that return the heuristic
+MAZE_HEURISTICS = {
+    "distance": exact_distance
+}
+
+
+def get_heuristic(heuristic, maze=None):
+    """Returns the named heuristic, or heuristic itself if it is a function of (state, goal).
+
+    Heuristics in MAZE_HEURISTICS are only available given the maze.
+    """
+    if callable(heuristic):
+        return heuristic
+    if heuristic in MAZE_HEURISTICS and maze is not None:
+        return MAZE_HEURISTICS[heuristic](maze)
+    if heuristic not in HEURISTICS:
+        raise Exception("unknown heuristic %r, expected one of %s" % (heuristic, ", ".join(list(HEURISTICS) + list(MAZE_HEURISTICS))))
+    return HEURISTICS[heuristic]
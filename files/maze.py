@@ -0,0 +1,334 @@
+import mmap
+import os
+import struct
+
+# Maps every character of a text maze to its wall byte: an open cell, the start
+# and the goal are 0, and every other character is a wall
+WALL_BYTES = bytes(0 if chr(i) in " AB" else 1 for i in range(256))
+
+# Maps a wall byte to 1 for an open cell and 0 for a wall
+OPEN_BYTES = bytes([1]) + bytes(255)
+
+# Binary maze files start with a fixed-size header: magic, format version, flags,
+# height, width, start row and col, goal row and col, padded to 64 bytes so that
+# the walls that follow are aligned. The walls take a byte per cell in row-major
+# order, 1 for a wall, or with the PACKED flag a bit per cell, most significant first.
+# With the NEIGHBORS flag the neighbor table follows them, a byte per cell
+MAGIC = b"MAZE"
+VERSION = 1
+PACKED = 1
+NEIGHBORS = 2
+HEADER = struct.Struct("<4sHH6q8x")
+
+# Cells of the neighbor table worked out at a time, see Maze.neighbor_table
+TABLE_BLOCK_CELLS = 1 << 20
+
+# Moves in the order the solvers try them. Bit i of a cell's entry in the
+# neighbor table is set when the move ACTIONS[i] leads to an open cell
+ACTIONS = ("up", "down", "left", "right")
+
+
+class Maze():
+    def __init__(self, height, width, walls, start, goal):
+        self.height = height
+        self.width = width
+        # One byte per cell in row-major order, 1 for a wall and 0 for an open cell
+        self.walls = walls
+        self.start = start
+        self.goal = goal
+
+        # Cell id offset of each move, and for every neighbor bitmask the
+        # (index into ACTIONS, offset) pairs of the moves it allows
+        offsets = (-width, width, -1, 1)
+        self.moves = tuple(
+            tuple((i, offsets[i]) for i in range(4) if mask & (1 << i))
+            for mask in range(16)
+        )
+        self._neighbor_table = None
+        self._digest = None
+        self._components = None
+
+    @classmethod
+    def from_file(cls, filename):
+
+        # Binary mazes are recognized by their magic, anything else is text
+        with open(filename, "rb") as f:
+            if f.read(len(MAGIC)) == MAGIC:
+                return cls.from_binary(filename)
+
+            # Parse the text as it is read, a line at a time
+            f.seek(0)
+            return cls.from_lines(f, os.fstat(f.fileno()).st_size)
+
+    @classmethod
+    def from_binary(cls, filename):
+        """Loads a binary maze file, mapping its walls into memory instead of reading them.
+
+        Byte walls are used straight from a copy-on-write mapping of the file, so
+        the operating system pages them in as the search touches them, and
+        changing them never writes back to the file. So is the neighbor table
+        stored with them, so that searches need no pass over the maze before
+        they start. Packed walls are unpacked into memory, which needs NumPy.
+        """
+        with open(filename, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(data) < HEADER.size:
+            raise Exception("%s is too short for a binary maze" % filename)
+        magic, version, flags, height, width, start_row, start_col, goal_row, goal_col = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise Exception("%s is not a version %d binary maze" % (filename, VERSION))
+
+        size = height * width
+        end = HEADER.size + ((size + 7) // 8 if flags & PACKED else size)
+        if len(data) < end + (size if flags & NEIGHBORS else 0):
+            raise Exception("%s is truncated" % filename)
+        if flags & PACKED:
+            import numpy as np
+            bits = np.frombuffer(data, dtype=np.uint8, count=(size + 7) // 8, offset=HEADER.size)
+            walls = bytearray(np.unpackbits(bits, count=size).tobytes())
+        else:
+            walls = memoryview(data)[HEADER.size:end]
+        maze = cls(height, width, walls, (start_row, start_col), (goal_row, goal_col))
+        if flags & NEIGHBORS:
+            maze._neighbor_table = memoryview(data)[end:end + size]
+        return maze
+
+    def to_binary(self, filename, packed=False, neighbors=True):
+        """Writes the maze to a binary maze file, with a bit per cell if packed (which needs NumPy).
+
+        Byte walls are followed by the neighbor table unless neighbors is false,
+        which doubles the size of the file. Packed files are meant to be small,
+        so they never store it.
+        """
+        neighbors = neighbors and not packed
+        flags = (PACKED if packed else 0) | (NEIGHBORS if neighbors else 0)
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, self.height, self.width, *self.start, *self.goal))
+            if packed:
+                import numpy as np
+                f.write(np.packbits(np.frombuffer(self.walls, dtype=np.uint8) != 0).tobytes())
+            else:
+                f.write(self.walls)
+            if neighbors:
+                f.write(self.neighbor_table())
+
+    def to_text(self, filename):
+        """Writes the maze to a text file, with # for walls, one row at a time."""
+        chars = bytes.maketrans(b"\0\1", b" #")
+        with open(filename, "wb") as f:
+            for row in range(self.height):
+                line = bytearray(bytes(self.walls[row * self.width:(row + 1) * self.width]).translate(chars))
+                for (r, c), char in ((self.start, "A"), (self.goal, "B")):
+                    if r == row:
+                        line[c] = ord(char)
+                f.write(line + b"\n")
+
+    @classmethod
+    def from_lines(cls, lines, size_hint=None):
+        """Parses the rows of a text maze in a single pass, from any iterable of str or bytes lines.
+
+        The width is that of the widest line, and shorter lines are padded with
+        open cells. If given, size_hint is the length of the text in bytes, used
+        to allocate the walls up front.
+        """
+        walls = None
+        start = goal = None
+        height = width = 0
+        for number, line in enumerate(lines, 1):
+            if isinstance(line, str):
+                line = line.encode()
+            line = line.rstrip(b"\r\n")
+
+            # The first line sets the width, and with it an estimate of the height
+            if walls is None:
+                width = len(line)
+                walls = bytearray(width * (size_hint // (width + 1) if size_hint else 1))
+
+            # A line wider than those before it widens the maze. That is rare, so
+            # the rows so far are just copied over, padded with open cells
+            elif len(line) > width:
+                rows = max(height + 1, len(walls) // width) if width else height + 1
+                wider = bytearray(len(line) * rows)
+                for row in range(height):
+                    wider[row * len(line):row * len(line) + width] = walls[row * width:(row + 1) * width]
+                walls = wider
+                width = len(line)
+
+            # Validate start and goal
+            if b"A" in line:
+                if start is not None or line.count(b"A") > 1:
+                    raise Exception("line %d: maze must have exactly one start point, found another" % number)
+                start = (height, line.index(b"A"))
+            if b"B" in line:
+                if goal is not None or line.count(b"B") > 1:
+                    raise Exception("line %d: maze must have exactly one goal, found another" % number)
+                goal = (height, line.index(b"B"))
+
+            # Keep track of walls, short rows are padded with open cells
+            offset = height * width
+            if len(walls) < offset + width:
+                walls.extend(bytes(max(width, len(walls) // 2)))
+            walls[offset:offset + len(line)] = line.translate(WALL_BYTES)
+            height += 1
+
+        if walls is None:
+            raise Exception("maze is empty")
+        if start is None:
+            raise Exception("maze must have exactly one start point")
+        if goal is None:
+            raise Exception("maze must have exactly one goal")
+        del walls[height * width:]
+        return cls(height, width, walls, start, goal)
+
+    def copy(self):
+        """Returns a maze with a copy of the walls, which can be changed without affecting this one.
+
+        What has been worked out about the walls so far, such as the components,
+        is carried over.
+        """
+        maze = Maze(self.height, self.width, bytearray(self.walls), self.start, self.goal)
+        maze._digest = self._digest
+        maze._components = self._components
+        if self._neighbor_table is not None:
+            maze._neighbor_table = bytearray(self._neighbor_table)
+        return maze
+
+    def contains(self, state):
+        """Returns whether state lies inside the maze."""
+        return 0 <= state[0] < self.height and 0 <= state[1] < self.width
+
+    def is_wall(self, state):
+        row, col = state
+        return self.walls[row * self.width + col] == 1
+
+    def set_wall(self, state, wall=True):
+        """Puts a wall on state, or opens it if wall is false.
+
+        The digest and components are worked out again when next asked for,
+        while a neighbor table already built is patched around state.
+        """
+        if state == self.start or state == self.goal:
+            raise Exception("cannot put a wall on the start or goal")
+        if not self.contains(state):
+            raise Exception("state %r is outside the maze" % (state,))
+        row, col = state
+        cell = row * self.width + col
+        if self.walls[cell] == int(bool(wall)):
+            return
+        self.walls[cell] = int(bool(wall))
+        self._digest = None
+        self._components = None
+
+        # Only state and the cells next to it have a different set of moves
+        if self._neighbor_table is not None:
+            table = self._neighbor_table
+            for action, offset in self.moves[15]:
+                neighbor = cell + offset
+                if action < 2 and 0 <= neighbor < len(table) or action >= 2 and neighbor // self.width == row:
+                    if wall:
+                        table[neighbor] &= ~(1 << (action ^ 1))
+                        table[cell] &= ~(1 << action)
+                    elif not self.walls[neighbor]:
+                        table[neighbor] |= 1 << (action ^ 1)
+                        table[cell] |= 1 << action
+
+    def cell(self, state):
+        """Returns the integer id of state, row * width + col."""
+        return state[0] * self.width + state[1]
+
+    def state(self, cell):
+        """Returns the (row, col) state of an integer cell id."""
+        return divmod(cell, self.width)
+
+    def components(self):
+        """Returns a flat NumPy array of the connected component id of every cell, -1 for walls.
+
+        Cells share an id when there is a path between them. The labeling takes a
+        few vectorized passes over the grid, see unionfind.py, and is kept for
+        later calls.
+        """
+        if self._components is None:
+            # NumPy is only loaded for mazes that get labeled
+            import numpy as np
+            from unionfind import label_components
+            open_cells = np.frombuffer(self.walls, dtype=np.uint8).reshape(self.height, self.width) == 0
+            self._components = label_components(open_cells).ravel()
+        return self._components
+
+    def connected(self, a, b):
+        """Returns whether there is a path between states a and b."""
+        components = self.components()
+        return components[self.cell(a)] == components[self.cell(b)] != -1
+
+    def maybe_connected(self, a, b):
+        """Returns False if there is certainly no path between states a and b, and True otherwise.
+
+        Only components already labeled are used, as labeling takes a pass over
+        the whole maze where a search that finds a path may touch a few cells.
+        Call components() first to have the solvers check them.
+        """
+        if self._components is None:
+            return True
+        return bool(self.connected(a, b))
+
+    def digest(self):
+        """Returns a hash of the maze's dimensions and walls, the same for every maze with the same grid."""
+        if self._digest is None:
+            # Only loaded for mazes that get hashed, by the distance heuristic or the solution cache
+            import hashlib
+            h = hashlib.blake2b(digest_size=16)
+            h.update(b"%d %d " % (self.height, self.width))
+            h.update(self.walls)
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def neighbor_table(self):
+        """Returns a writable bytes-like object holding the bitmask of open neighbors of every cell.
+
+        The table is built on first use, unless it was loaded with a binary maze.
+        """
+        if self._neighbor_table is None:
+            height, width, size = self.height, self.width, self.height * self.width
+
+            # Treat a block of rows at a time as one big integer with a byte per cell,
+            # so shifts and masks over the block run in C instead of a Python loop
+            # per cell, while the integers stay a few times the size of the block.
+            # Each block takes along the rows just above and below it, to see the
+            # cells its edge rows lead to
+            table = bytearray(size)
+            block_rows = max(1, TABLE_BLOCK_CELLS // width)
+            for first in range(0, height, block_rows):
+                last = min(first + block_rows, height)
+                top, bottom = max(first - 1, 0), min(last + 1, height)
+                rows = bottom - top
+
+                # Walls mapped from a binary file are a memoryview, which has no translate
+                is_open = int.from_bytes(bytes(self.walls[top * width:bottom * width]).translate(OPEN_BYTES), "little")
+                not_first_col = int.from_bytes((bytes(1) + bytes([1]) * (width - 1)) * rows, "little")
+                not_last_col = int.from_bytes((bytes([1]) * (width - 1) + bytes(1)) * rows, "little")
+
+                up = is_open << (8 * width)
+                down = is_open >> (8 * width)
+                left = (is_open << 8) & not_first_col
+                right = (is_open >> 8) & not_last_col
+
+                # Walls get no moves, multiplying by 15 turns each open byte into 0b1111
+                block = ((up | down << 1 | left << 2 | right << 3) & (is_open * 15)).to_bytes(rows * width, "little")
+                table[first * width:last * width] = block[(first - top) * width:(last - top) * width]
+            self._neighbor_table = table
+        return self._neighbor_table
+
+    def neighbors(self, state):
+        """Returns the (action, state) pairs of the open cells next to state."""
+        cell = self.cell(state)
+        return [
+            (ACTIONS[action], self.state(cell + offset))
+            for action, offset in self.moves[self.neighbor_table()[cell]]
+        ]
+
+
+def load_maze(maze):
+    """Returns maze as a Maze, parsing it first if given a filename."""
+    if isinstance(maze, Maze):
+        return maze
+    return Maze.from_file(maze)
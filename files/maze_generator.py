@@ -1,74 +1,289 @@
-import random
-import sys
-
-if len(sys.argv) != 3:
-    sys.exit("Usage: python filename.py length width")
-
-maze_len = int(sys.argv[1])
-maze_width = int(sys.argv[2])
-
-def rand_generator():
-    n = random.randint(0,2)
-    if(n == 0):
-        return True
-    else:
-        return False
-
-maze = []
-temp_row = []
-for i in range(0,maze_width):
-    temp_row.append("#")
-maze.append(temp_row)
-for i in range (1,maze_len-1):
-    maze_row = []
-    maze_row.append("#")
-    for j in range (1,maze_width-1):
-        if(rand_generator()):
-            maze_row.append("#")
-        else:
-
-
-            
-            maze_row.append(" ")
-    maze_row.append("#")
-    maze.append(maze_row)
-temp_row = []
-for i in range(0,maze_width):
-    temp_row.append("#")
-    
-maze.append(temp_row)
-
-quadrants = []
-q1 = [[1,maze_len//2],[1,maze_width//2]]
-q2 = [[1,maze_len//2],[maze_width//2+1,maze_width-1]]
-q3 = [[maze_len//2+1, maze_len-1],[1,maze_width]]
-q4 = [[maze_len//2+1,maze_len-1],[maze_width//2+1,maze_width-1]]
-
-quadrants.append(q1)
-quadrants.append(q2)
-quadrants.append(q3)
-quadrants.append(q4)
-
-rand_st_index = random.randint(0,3)
-rand_start = quadrants[rand_st_index]
-
-rand_end_index = random.randint(0,3)
-rand_end = quadrants[rand_end_index]
-
-
-start_x,start_y = random.randint(rand_start[0][0],rand_start[0][1]),random.randint(rand_start[1][0],rand_start[1][1])
-goal_x,goal_y = random.randint(rand_end[0][0],rand_end[0][1]),random.randint(rand_end[1][0],rand_end[1][1])
-
-while(goal_x != start_x and goal_y != start_y):
-    goal_x,goal_y = random.randint(rand_end[0][0],rand_end[0][1]),random.randint(rand_end[1][0],rand_end[1][1])
-
-maze[start_x][start_y] = "A"
-maze[goal_x][goal_y] = "B"
-
-maze_file = open("maze/random_maze.txt","w+")
-for i in range(0,maze_len):
-    str = ""
-    for j in range(0,maze_width):
-        str += maze[i][j]
-    maze_file.write(str)
-    maze_file.write("\n")
\ No newline at end of file
+import argparse
+import itertools
+import numpy as np
+from maze import Maze
+from unionfind import flatten, label_components, make_sets
+
+# Characters of the generated mazes, as bytes
+WALL, OPEN, START, GOAL, NEWLINE = b"# AB\n"
+
+# Cells generated at a time, so that memory stays bounded however large the maze
+BLOCK_CELLS = 1 << 22
+
+# The orders in which the recursive backtracker may try the four directions
+DIRECTION_ORDERS = list(itertools.permutations(range(4)))
+
+
+def place_endpoints(rng, height, width):
+    """Returns distinct random start and goal cells inside the border, each in a random quadrant."""
+    if height < 3 or width < 3 or (height - 2) * (width - 2) < 2:
+        raise Exception("maze must have at least two cells inside its border")
+
+    # Quadrants as (first row, last row, first col, last col), dropping the empty
+    # ones that very narrow mazes have
+    half_rows, half_cols = height // 2, width // 2
+    quadrants = [
+        (1, half_rows, 1, half_cols),
+        (1, half_rows, half_cols + 1, width - 2),
+        (half_rows + 1, height - 2, 1, half_cols),
+        (half_rows + 1, height - 2, half_cols + 1, width - 2)
+    ]
+    quadrants = [q for q in quadrants if q[0] <= q[1] and q[2] <= q[3]]
+
+    top, bottom, left, right = quadrants[rng.integers(len(quadrants))]
+    start = (int(rng.integers(top, bottom + 1)), int(rng.integers(left, right + 1)))
+
+    # Pick the goal among the cells of its quadrant other than the start, so it
+    # takes a single draw rather than retrying until the two differ
+    choices = [q for q in quadrants if q != (start[0], start[0], start[1], start[1])]
+    top, bottom, left, right = choices[rng.integers(len(choices))]
+    cols = right - left + 1
+    cells = (bottom - top + 1) * cols
+    inside = top <= start[0] <= bottom and left <= start[1] <= right
+    index = int(rng.integers(cells - inside))
+    if inside and index >= (start[0] - top) * cols + start[1] - left:
+        index += 1
+    goal = (top + index // cols, left + index % cols)
+    return start, goal
+
+
+def random_blocks(height, width, density=1/3, seed=None):
+    """Yields (first row, block) pairs that make up a random maze, from top to bottom.
+
+    Each block is a uint8 array of the maze's characters. The maze has a wall
+    all around, and every cell inside is a wall with probability density.
+    """
+    rng = np.random.default_rng(seed)
+    start, goal = place_endpoints(rng, height, width)
+    chars = np.array([OPEN, WALL], dtype=np.uint8)
+
+    block_rows = max(1, BLOCK_CELLS // width)
+    for first in range(0, height, block_rows):
+        rows = min(block_rows, height - first)
+        block = np.full((rows, width), WALL, dtype=np.uint8)
+
+        # Rows of the block inside the top and bottom borders
+        low, high = max(first, 1) - first, min(first + rows, height - 1) - first
+        if low < high:
+            block[low:high, 1:-1] = chars[(rng.random((high - low, width - 2), dtype=np.float32) < density).view(np.uint8)]
+
+        for (row, col), char in ((start, START), (goal, GOAL)):
+            if first <= row < first + rows:
+                block[row - first, col] = char
+        yield first, block
+
+
+def open_blocks(height, width, density=1/3, seed=None):
+    """Yields a random maze like random_blocks, with a path from the start to the goal.
+
+    The maze is labeled into connected components of open cells, and if the
+    start and the goal fall in different ones, a random staircase of cells
+    between them is opened up.
+    """
+    grid = np.concatenate([block for first, block in random_blocks(height, width, density, seed)])
+    (start,), (goal,) = np.argwhere(grid == START), np.argwhere(grid == GOAL)
+    labels = label_components(grid != WALL)
+    if labels[tuple(start)] != labels[tuple(goal)]:
+        # Shuffle the vertical and horizontal steps from the start to the goal
+        rng = np.random.default_rng(seed)
+        rows, cols = goal - start
+        steps = np.zeros((abs(rows) + abs(cols), 2), dtype=np.int64)
+        steps[:abs(rows), 0] = np.sign(rows)
+        steps[abs(rows):, 1] = np.sign(cols)
+        path = start + np.cumsum(rng.permutation(steps), axis=0)[:-1]
+        grid[path[:, 0], path[:, 1]] = OPEN
+    yield 0, grid
+
+
+def perfect_maze_nodes(height, width, seed):
+    """Returns the rng, node grid shape and start and goal nodes of a perfect maze.
+
+    Perfect mazes are trees over the nodes at odd rows and columns of the
+    grid, the cells between two nodes being opened for the tree's edges.
+    """
+    rng = np.random.default_rng(seed)
+    node_rows, node_cols = (height - 1) // 2, (width - 1) // 2
+    if node_rows < 1 or node_cols < 1 or node_rows * node_cols < 2:
+        raise Exception("maze is too small for a perfect maze")
+    start, goal = place_endpoints(rng, node_rows + 2, node_cols + 2)
+    return rng, node_rows, node_cols, (start[0] - 1, start[1] - 1), (goal[0] - 1, goal[1] - 1)
+
+
+def node_grid(height, width, nodes, start, goal):
+    """Returns the maze grid with the given nodes, and start and goal nodes, marked."""
+    grid = np.full((height, width), WALL, dtype=np.uint8)
+    grid[2 * nodes[0] + 1, 2 * nodes[1] + 1] = OPEN
+    grid[2 * start[0] + 1, 2 * start[1] + 1] = START
+    grid[2 * goal[0] + 1, 2 * goal[1] + 1] = GOAL
+    return grid
+
+
+def kruskal_blocks(height, width, density=None, seed=None):
+    """Yields a perfect maze built with randomized Kruskal's algorithm, ignoring density.
+
+    Kruskal's algorithm takes the edges of the node grid in random order and
+    keeps those joining two different trees, which gives the minimum spanning
+    tree for edges weighted by their position in that order. That same tree is
+    found here with Boruvka's algorithm on a union-find parent array, every
+    tree taking its cheapest outgoing edge at once, so each of the
+    logarithmically many rounds is a vectorized pass over the edges left.
+    """
+    rng, node_rows, node_cols, start, goal = perfect_maze_nodes(height, width, seed)
+    parent = make_sets(node_rows * node_cols)
+    ids = np.arange(node_rows * node_cols, dtype=parent.dtype).reshape(node_rows, node_cols)
+
+    # The edges to the right and downwards, in grid order, each with a distinct random weight
+    a = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    b = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    index_type = np.int32 if len(a) < 2 ** 31 else np.int64
+    weight = rng.permutation(len(a)).astype(index_type)
+
+    # Edges between two trees, by index, and the trees they join
+    tree = np.zeros(len(a), dtype=bool)
+    remaining = np.arange(len(a), dtype=index_type)
+    tree_a, tree_b = a, b
+    while True:
+        # Follow the merges of the last round, and drop the edges now within a tree
+        tree_a, tree_b = parent[tree_a], parent[tree_b]
+        apart = tree_a != tree_b
+        remaining, tree_a, tree_b = remaining[apart], tree_a[apart], tree_b[apart]
+        if not len(remaining):
+            break
+
+        # Every tree takes its cheapest edge to another tree
+        edge_weight = weight[remaining]
+        cheapest = np.full(len(parent), len(a), dtype=index_type)
+        np.minimum.at(cheapest, tree_a, edge_weight)
+        np.minimum.at(cheapest, tree_b, edge_weight)
+        taken_a, taken_b = cheapest[tree_a] == edge_weight, cheapest[tree_b] == edge_weight
+        tree[remaining[taken_a | taken_b]] = True
+
+        # Hook every tree under the tree its edge leads to. With distinct weights
+        # the only cycles are pairs of trees taking the same edge, and the
+        # smaller of each pair stays a root
+        hooked = np.concatenate([tree_a[taken_a], tree_b[taken_b]])
+        parent[hooked] = np.concatenate([tree_b[taken_a], tree_a[taken_b]])
+        mutual = hooked[(parent[parent[hooked]] == hooked) & (hooked < parent[hooked])]
+        parent[mutual] = mutual
+        flatten(parent)
+
+    grid = node_grid(height, width, np.divmod(ids.ravel(), node_cols), start, goal)
+
+    # Open the cell between the two nodes of every tree edge
+    a, b = a[tree], b[tree]
+    grid[(a // node_cols) + (b // node_cols) + 1, (a % node_cols) + (b % node_cols) + 1] = OPEN
+    yield 0, grid
+
+
+def backtracker_blocks(height, width, density=None, seed=None):
+    """Yields a perfect maze built with an iterative recursive backtracker, ignoring density.
+
+    A depth-first walk from the start node moves to a random unvisited
+    neighbor, opening the wall in between, and backs up when there is none.
+    Each node tries the directions in an order drawn for it up front, which
+    picks uniformly among its unvisited neighbors like a draw at every step.
+    """
+    rng, node_rows, node_cols, start, goal = perfect_maze_nodes(height, width, seed)
+    orders = rng.integers(len(DIRECTION_ORDERS), size=node_rows * node_cols, dtype=np.uint8).tobytes()
+    visited = bytearray(node_rows * node_cols)
+    tried = bytearray(node_rows * node_cols)
+
+    # Nodes are numbered row-major over the node grid, steps are up, down, left and right
+    node_steps = (-node_cols, node_cols, -1, 1)
+    edges = bytearray(node_rows * node_cols)
+    node = start[0] * node_cols + start[1]
+    visited[node] = 1
+    stack = [node]
+    while stack:
+        node = stack[-1]
+        if tried[node] == 4:
+            stack.pop()
+            continue
+        direction = DIRECTION_ORDERS[orders[node]][tried[node]]
+        tried[node] += 1
+
+        row, col = divmod(node, node_cols)
+        if direction == 0 and row == 0 or direction == 1 and row == node_rows - 1:
+            continue
+        if direction == 2 and col == 0 or direction == 3 and col == node_cols - 1:
+            continue
+        neighbor = node + node_steps[direction]
+        if not visited[neighbor]:
+            visited[neighbor] = 1
+            # Remember the direction of the move into the neighbor, 1-based
+            edges[neighbor] = direction + 1
+            stack.append(neighbor)
+
+    ids = np.arange(node_rows * node_cols)
+    grid = node_grid(height, width, np.divmod(ids, node_cols), start, goal)
+
+    # Open the cell between every node and the node it was reached from
+    entered = np.frombuffer(edges, dtype=np.uint8).astype(np.int64)
+    reached = np.nonzero(entered)[0]
+    direction = entered[reached] - 1
+    rows, cols = np.divmod(reached, node_cols)
+    grid[2 * rows + 1 + (direction == 0) - (direction == 1), 2 * cols + 1 + (direction == 2) - (direction == 3)] = OPEN
+    yield 0, grid
+
+
+# Maze generators by the name used to select them on the command line. Only
+# random mazes may have no path from the start to the goal
+GENERATORS = {
+    "random": random_blocks,
+    "open": open_blocks,
+    "kruskal": kruskal_blocks,
+    "backtracker": backtracker_blocks
+}
+
+
+def write_maze(filename, blocks):
+    """Writes the (first row, block) pairs of a maze to a text file, one block at a time."""
+    with open(filename, "wb") as f:
+        for first, block in blocks:
+            lines = np.empty((block.shape[0], block.shape[1] + 1), dtype=np.uint8)
+            lines[:, :-1] = block
+            lines[:, -1] = NEWLINE
+            f.write(lines)
+
+
+def blocks_to_maze(height, width, blocks):
+    """Returns the Maze made up of the (first row, block) pairs of a maze, without going through text."""
+    walls = bytearray(height * width)
+    for first, block in blocks:
+        walls[first * width:(first + block.shape[0]) * width] = (block == WALL).tobytes()
+        for row, col in zip(*np.nonzero((block == START) | (block == GOAL))):
+            if block[row, col] == START:
+                start = (first + int(row), int(col))
+            else:
+                goal = (first + int(row), int(col))
+    return Maze(height, width, walls, start, goal)
+
+
+def generate_maze(maze_len, maze_width, density=1/3, seed=None, algorithm="random"):
+    """Returns the rows of a maze_len x maze_width maze made by the named generator.
+
+    Random mazes have walls placed with probability density.
+    """
+    return [
+        row.tobytes().decode("ascii")
+        for first, block in GENERATORS[algorithm](maze_len, maze_width, density, seed)
+        for row in block
+    ]
+
+
+def random_maze(maze_len, maze_width, density=1/3, seed=None, algorithm="random"):
+    """Returns the Maze that generate_maze would make with the same arguments."""
+    return blocks_to_maze(maze_len, maze_width, GENERATORS[algorithm](maze_len, maze_width, density, seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a random maze.")
+    parser.add_argument("length", type=int, help="number of rows")
+    parser.add_argument("width", type=int, help="number of columns")
+    parser.add_argument("--algorithm", default="random", choices=GENERATORS, help="how the maze is generated")
+    parser.add_argument("--density", type=float, default=1/3, help="probability of a cell being a wall, for random and open mazes")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random number generator")
+    parser.add_argument("--output", default="maze/random_maze.txt", help="file to write the maze to")
+    args = parser.parse_args()
+
+    write_maze(args.output, GENERATORS[args.algorithm](args.length, args.width, args.density, args.seed))
@@ -0,0 +1,73 @@
+import time
+from structures import CellSet
+
+
+class SearchResult():
+    """Metrics of one call to a solver's solve(), measured inside the search itself."""
+    __slots__ = ("algorithm", "solved", "path_length", "num_explored", "num_generated", "max_frontier", "time_ns")
+
+    def __init__(self, algorithm, solved, path_length, num_explored, num_generated, max_frontier, time_ns):
+        self.algorithm = algorithm
+        self.solved = solved
+        # Number of moves in the solution, 0 if there is none
+        self.path_length = path_length
+        # Number of states taken off the frontier and expanded
+        self.num_explored = num_explored
+        # Number of states put on the frontier, the start included
+        self.num_generated = num_generated
+        # Largest number of states on the frontier at once
+        self.max_frontier = max_frontier
+        # Wall-clock time of the search in nanoseconds
+        self.time_ns = time_ns
+
+    @property
+    def time_taken(self):
+        return self.time_ns / 1e9
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return "SearchResult(%s)" % ", ".join("%s=%r" % item for item in self.as_dict().items())
+
+
+def record_result(solver, start_time, num_explored, num_generated, max_frontier):
+    """Stores the metrics of the search solver just finished, started at perf_counter_ns() start_time.
+
+    The metrics are kept both as solver.result and as attributes of the
+    solver, and the result is returned.
+    """
+    solved = solver.solution is not None
+    return restore_result(solver, SearchResult(
+        algorithm=type(solver).__name__,
+        solved=solved,
+        path_length=len(solver.solution[0]) if solved else 0,
+        num_explored=num_explored,
+        num_generated=num_generated,
+        max_frontier=max_frontier,
+        time_ns=time.perf_counter_ns() - start_time
+    ))
+
+
+def restore_result(solver, result):
+    """Stores result as the metrics of solver, as record_result does, and returns it."""
+    solver.result = result
+    solver.num_explored = result.num_explored
+    solver.num_generated = result.num_generated
+    solver.max_frontier = result.max_frontier
+    solver.path_length = result.path_length
+    solver.time_ns = result.time_ns
+    solver.time_taken = result.time_taken
+    return result
+
+
+def check_connected(solver, start_time):
+    """Raises "no solution" at once if the maze's components show the goal cannot be reached.
+
+    The search is recorded as having explored nothing. Only labels the maze
+    already has are used, see Maze.maybe_connected.
+    """
+    if not solver.maze.maybe_connected(solver.start, solver.goal):
+        solver.explored = CellSet(solver.height * solver.width) if getattr(solver, "track_explored", True) else None
+        record_result(solver, start_time, 0, 1, 0)
+        raise Exception("no solution")
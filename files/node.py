@@ -1,5 +1,53 @@
+from array import array
+from maze import ACTIONS
+
+
 class Node():
+    __slots__ = ("state", "parent", "action")
+
     def __init__(self, state, parent, action):
         self.state = state
         self.parent = parent
-        self.action = action
\ No newline at end of file
+        self.action = action
+
+
+class SearchTree():
+    """Search tree over integer cell ids, stored as flat arrays instead of Node objects."""
+
+    def __init__(self, size):
+        # Parent id of every reached cell, -1 for the root and for unreached cells
+        self.parents = array("i" if size < 2 ** 31 else "q", [-1]) * size
+        # Index into ACTIONS of the move that reached every cell
+        self.actions = bytearray(size)
+
+    def add(self, cell, parent, action):
+        self.parents[cell] = parent
+        self.actions[cell] = action
+
+    def path(self, cell):
+        """Returns the actions and cell ids leading from the root to cell, root excluded."""
+        actions = []
+        cells = []
+        while self.parents[cell] != -1:
+            actions.append(ACTIONS[self.actions[cell]])
+            cells.append(cell)
+            cell = self.parents[cell]
+        actions.reverse()
+        cells.reverse()
+        return actions, cells
+
+    def reverse_path(self, cell, flip=0):
+        """Returns the actions and cell ids leading from cell back to the root, cell excluded.
+
+        Only meaningful for trees that record, for every cell, the move from the
+        cell to its parent, as the backward half of a bidirectional search does,
+        or with flip=1 for trees that record the move from the parent, which
+        ACTIONS pairs with its opposite.
+        """
+        actions = []
+        cells = []
+        while self.parents[cell] != -1:
+            actions.append(ACTIONS[self.actions[cell] ^ flip])
+            cell = self.parents[cell]
+            cells.append(cell)
+        return actions, cells
@@ -1,57 +1,80 @@
+import argparse
+import inspect
+import json
 import sys
-from AStar import A_star_Search
-from BFS import BreadthFirstSearch
-from DFS import DepthFirstSearch
-from GBFS import GreedyBestFirstSearch
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt ")
-maze = sys.argv[1]
-
-choice = input("Do you wish to see the explored states in the solution?\nEnter Yes or No:")
-print(choice.lower())
-while(choice.lower() != "yes" and choice.lower() != "no"):
-    print("Invalid Choice. Please re enter your choice: ")
-    choice = input()
-if choice.lower() == "yes":
-    choice = True
-else:
-    choice = False
-#bfs
-m1 = BreadthFirstSearch(maze)
-print("Maze: ")
-m1.print()
-m1.output_image(empty=True)
-m1.solve()
-m1.output_image(show_explored = choice)
-if(choice):
-    print("States Explored in Breadth First Search: ",m1.num_explored)
-print("Length of path found in Breadth First Search: ",m1.path_length)
-print("%f" % m1.time_taken)
-
-#dfs
-m2 = DepthFirstSearch(maze)
-m2.solve()
-m2.output_image(show_explored = choice)
-if(choice):
-    print("States Explored in Depth First Search: ",m2.num_explored)
-print("Length of path found in Depth First Search: ",m2.path_length)
-print("%f" % m2.time_taken)
-
-#gbfs
-m3 = GreedyBestFirstSearch(maze)
-m3.solve()
-m3.output_image(show_explored = choice)
-if(choice):
-    print("States Explored in Greedy Best First Search: ",m3.num_explored)
-print("Length of path found in Greedy Best First Search: ",m3.path_length)
-print("%f" % m3.time_taken)
-
-#a*
-m4 = A_star_Search(maze)
-m4.solve()
-m4.output_image(show_explored = choice)
-if(choice):
-    print("States Explored in A* Search: ",m4.num_explored)
-print("Length of path found in A* search: ",m4.path_length)
-print("%f" % m4.time_taken)
\ No newline at end of file
+from algorithms import ALGORITHMS, DEFAULT_ALGORITHMS
+from heuristics import HEURISTICS, MAZE_HEURISTICS
+from maze import Maze
+
+parser = argparse.ArgumentParser(description="Solve a maze with the chosen search algorithms.")
+parser.add_argument("maze", help="text or binary maze file")
+parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=ALGORITHMS)
+parser.add_argument("--heuristic", choices=list(HEURISTICS) + list(MAZE_HEURISTICS), help="heuristic of the informed searches")
+parser.add_argument("--no-images", action="store_true", help="do not write the maze and solution images")
+parser.add_argument("--show-explored", action="store_true", help="report and draw the states explored")
+parser.add_argument("--json", action="store_true", help="print the results as JSON instead of text")
+parser.add_argument("--cache", help="directory of a cache of solutions, reused by later runs")
+parser.add_argument("--precheck", action="store_true", help="label the maze's components first, so that the searches give up at once when there is no path")
+args = parser.parse_args()
+
+# D* Lite measures its heuristic from a start that moves, on walls that change
+if args.heuristic in MAZE_HEURISTICS and "dstarlite" in args.algorithms:
+    parser.error("dstarlite cannot use the %s heuristic" % args.heuristic)
+
+# Parse the maze once and share it between all the searches
+maze = Maze.from_file(args.maze)
+# The solution cache, and with it SQLite, is only loaded when asked for
+cache = None
+if args.cache:
+    from solution_cache import SolutionCache
+    cache = SolutionCache(args.cache)
+if args.precheck:
+    maze.components()
+
+#maze
+if not args.json:
+    print("Maze: ")
+    ALGORITHMS["bfs"][1](maze).print()
+if not args.no_images:
+    ALGORITHMS["bfs"][1](maze).output_image(empty=True)
+
+results = []
+for name in args.algorithms:
+    title, solver = ALGORITHMS[name]
+    # Only the informed searches, which have a heuristic, take one, and the
+    # memory-bounded ones only keep the states explored when asked to
+    options = {}
+    parameters = inspect.signature(solver).parameters
+    if args.heuristic and "heuristic" in parameters:
+        options["heuristic"] = args.heuristic
+    if "track_explored" in parameters:
+        options["track_explored"] = args.show_explored
+    m = solver(maze, **options)
+    if cache is not None:
+        cache.solve(m, name, args.heuristic)
+    else:
+        try:
+            m.solve()
+        except Exception as e:
+            if str(e) != "no solution":
+                raise
+    if not args.no_images:
+        m.output_image(show_explored=args.show_explored)
+    results.append(dict(m.result.as_dict(), algorithm=name))
+
+    if args.json:
+        continue
+    if args.show_explored:
+        print("States Explored in %s: " % title, m.num_explored)
+    if m.solution is None:
+        print("No path found in %s" % title)
+    else:
+        print("Length of path found in %s: " % title, m.path_length)
+    print("%f" % m.time_taken)
+
+if cache is not None:
+    cache.close()
+
+if args.json:
+    json.dump(results, sys.stdout, indent=2)
+    print()
@@ -0,0 +1,149 @@
+import heapq
+import time
+from collections import deque
+from maze import load_maze
+from node import SearchTree
+from structures import CellSet
+
+
+class QueryResult():
+    """Metrics of one call to MultiQuerySearch.solve()."""
+    __slots__ = ("num_queries", "num_answered", "num_searches", "num_explored", "time_ns")
+
+    def __init__(self, num_queries, num_answered, num_searches, num_explored, time_ns):
+        self.num_queries = num_queries
+        # Number of queries with a path
+        self.num_answered = num_answered
+        # Number of breadth first searches run to answer them
+        self.num_searches = num_searches
+        # Number of states expanded over all of the searches
+        self.num_explored = num_explored
+        # Wall-clock time in nanoseconds
+        self.time_ns = time_ns
+
+    @property
+    def time_taken(self):
+        return self.time_ns / 1e9
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return "QueryResult(%s)" % ", ".join("%s=%r" % item for item in self.as_dict().items())
+
+
+class MultiQuerySearch():
+    """Answers many (start, goal) shortest path queries on one maze.
+
+    Each breadth first search starts from the cell shared by the most queries
+    still unanswered, whether as their start or their goal, and stops once it
+    has reached the other end of every one of them. Moves all cost the same
+    and can be reversed, so a search from a goal finds shortest paths to it
+    just as well as searches from each start would. The metrics of the last
+    solve() are kept as self.result, and as attributes like a solver's.
+    """
+
+    def __init__(self, maze):
+        self.maze = load_maze(maze)
+        self.result = None
+
+    def solve(self, queries):
+        """Returns a shortest solution for each (start, goal) pair of queries, in order.
+
+        Each solution is an (actions, states) pair like a solver's solution, or
+        None if the goal cannot be reached from the start. Only queries within
+        one connected component of the maze are searched.
+        """
+        start_time = time.perf_counter_ns()
+        queries = list(queries)
+        cells = []
+        for start, goal in queries:
+            for state in (start, goal):
+                if not self.maze.contains(state) or self.maze.is_wall(state):
+                    raise Exception("query state %r is not an open cell of the maze" % (state,))
+            cells.append((self.maze.cell(start), self.maze.cell(goal)))
+
+        # Queries still to answer by the cells at their ends. Queries between
+        # different components are answered at once, see Maze.components
+        components = self.maze.components()
+        solutions = [None] * len(queries)
+        pending = {}
+        for index, (start, goal) in enumerate(cells):
+            if start == goal:
+                solutions[index] = ([], [])
+            elif components[start] == components[goal]:
+                pending.setdefault(start, set()).add(index)
+                pending.setdefault(goal, set()).add(index)
+
+        # Cells by the number of queries they share, largest first. Counts only
+        # fall, so entries whose count went stale are pushed again when popped
+        heap = [(-len(indices), cell) for cell, indices in pending.items()]
+        heapq.heapify(heap)
+        num_searches = num_explored = 0
+        while heap:
+            count, root = heapq.heappop(heap)
+            indices = pending.get(root)
+            if indices is None:
+                continue
+            if len(indices) != -count:
+                heapq.heappush(heap, (-len(indices), root))
+                continue
+
+            del pending[root]
+            targets = set(goal if start == root else start for start, goal in (cells[index] for index in indices))
+            tree, explored = self.search(root, targets)
+            num_searches += 1
+            num_explored += explored
+            for index in indices:
+                start, goal = cells[index]
+                if start == root:
+                    actions, path = tree.path(goal)
+                    other = goal
+                else:
+                    actions, path = tree.reverse_path(start, flip=1)
+                    other = start
+                solutions[index] = (actions, [self.maze.state(cell) for cell in path])
+                pending[other].discard(index)
+                if not pending[other]:
+                    del pending[other]
+
+        self.result = QueryResult(
+            num_queries=len(queries),
+            num_answered=sum(solution is not None for solution in solutions),
+            num_searches=num_searches,
+            num_explored=num_explored,
+            time_ns=time.perf_counter_ns() - start_time
+        )
+        self.num_searches = self.result.num_searches
+        self.num_explored = self.result.num_explored
+        self.time_ns = self.result.time_ns
+        self.time_taken = self.result.time_taken
+        return solutions
+
+    def search(self, root, targets):
+        """Runs a breadth first search from root until every target is reached.
+
+        Returns the search tree, which records the move from each cell's parent,
+        and the number of cells expanded.
+        """
+        table = self.maze.neighbor_table()
+        moves = self.maze.moves
+        size = self.maze.height * self.maze.width
+
+        tree = SearchTree(size)
+        reached = CellSet(size)
+        reached.add(root)
+        targets.discard(root)
+        frontier = deque([root])
+        num_explored = 0
+        while frontier and targets:
+            node = frontier.popleft()
+            num_explored += 1
+            for action, offset in moves[table[node]]:
+                state = node + offset
+                if state not in reached:
+                    reached.add(state)
+                    tree.add(state, node, action)
+                    targets.discard(state)
+                    frontier.append(state)
+        return tree, num_explored
@@ -0,0 +1,107 @@
+import numpy as np
+from PIL import Image
+from structures import CellSet
+
+# Kinds of cell, indexing PALETTE
+WALL, EMPTY, EXPLORED, SOLUTION, START, GOAL = range(6)
+
+PALETTE = np.array([
+    (40, 40, 40),
+    (237, 240, 252),
+    (252, 252, 125),
+    (249, 97, 103),
+    (255, 0, 0),
+    (0, 171, 28)
+], dtype=np.uint8)
+
+# Longest side of a rendered image in pixels. Cells are drawn smaller than
+# the requested size when the maze would not fit otherwise, and mazes with
+# more cells a side than this are shrunk, a block of cells to a pixel
+MAX_SIDE = 4096
+
+# Cells colored at a time, see render
+BAND_CELLS = 1 << 22
+
+
+def sorted_cells(maze, states):
+    """Returns the states as a sorted NumPy array of cell ids."""
+    rows, cols = np.array(states, dtype=np.int64).reshape(-1, 2).T
+    return np.sort(rows * maze.width + cols)
+
+
+def band_kinds(maze, first, last, solution, explored):
+    """Returns the kinds of the cells in rows first to last of maze, as a 2D array.
+
+    solution and explored hold sorted cell ids, or explored is a CellSet.
+    """
+    width = maze.width
+    begin, end = first * width, last * width
+
+    # Later kinds paint over earlier ones
+    walls = np.frombuffer(maze.walls, dtype=np.uint8, count=end - begin, offset=begin)
+    kinds = np.full(end - begin, EMPTY, dtype=np.uint8)
+    kinds[walls != 0] = WALL
+    if isinstance(explored, CellSet):
+        bits = np.frombuffer(explored.bits, dtype=np.uint8)[begin // 8:(end + 7) // 8]
+        mask = np.unpackbits(bits, bitorder="little")[begin % 8:begin % 8 + end - begin]
+        kinds[mask.astype(bool)] = EXPLORED
+    for cells, kind in ((explored, EXPLORED), (solution, SOLUTION)):
+        if cells is not None and not isinstance(cells, CellSet):
+            cells = cells[np.searchsorted(cells, begin):np.searchsorted(cells, end)]
+            kinds[cells - begin] = kind
+    for (row, col), kind in ((maze.start, START), (maze.goal, GOAL)):
+        if first <= row < last:
+            kinds[(row - first) * width + col] = kind
+    return kinds.reshape(last - first, width)
+
+
+def render(maze, filename, solution=None, explored=None, show_solution=True, show_explored=False,
+           cell_size=50, cell_border=2):
+    """Saves an image of maze, with the solution and explored cells colored if shown."""
+    height, width = maze.height, maze.width
+
+    # Solution and explored cells as sorted cell ids, so each band of rows
+    # picks out its own. An explored CellSet is read a band at a time as is
+    if solution is None or not (show_explored and explored is not None):
+        explored = None
+    elif not isinstance(explored, CellSet):
+        explored = np.sort(np.fromiter(explored, dtype=np.int64))
+    if solution is not None and show_solution and solution[1]:
+        solution = sorted_cells(maze, solution[1])
+    else:
+        solution = None
+
+    # Color the cells a band of rows at a time, so that memory stays bounded
+    # however large the maze. Mazes that do not fit in MAX_SIDE at a pixel
+    # a cell are shrunk by a whole factor, each pixel showing the highest kind
+    # among its block of cells, so that the solution, start and goal stay visible
+    factor = -(-max(height, width) // MAX_SIDE)
+    band_rows = factor * max(1, BAND_CELLS // (width * factor))
+    bands = []
+    for first in range(0, height, band_rows):
+        kinds = band_kinds(maze, first, min(first + band_rows, height), solution, explored)
+        if factor > 1:
+            rows, cols = -(-kinds.shape[0] // factor), -(-width // factor)
+            padded = np.zeros((rows * factor, cols * factor), dtype=np.uint8)
+            padded[:kinds.shape[0], :width] = kinds
+            kinds = padded.reshape(rows, factor, cols, factor).max(axis=(1, 3))
+        bands.append(kinds)
+    kinds = np.concatenate(bands)
+    height, width = kinds.shape
+
+    # Scale cells up with nearest-neighbor repetition, shrinking them (and
+    # their borders) when the image would get too large
+    size = max(1, min(cell_size, MAX_SIDE // max(height, width)))
+    border = cell_border * size // cell_size
+    pixels = PALETTE[kinds]
+    if size > 1:
+        pixels = np.repeat(np.repeat(pixels, size, axis=0), size, axis=1)
+
+    # Draw cell borders in black
+    if border:
+        edge = np.arange(size)
+        edge = (edge < border) | (edge >= size - border)
+        pixels[np.tile(edge, height)] = 0
+        pixels[:, np.tile(edge, width)] = 0
+
+    Image.fromarray(pixels, "RGB").save(filename, compress_level=1)
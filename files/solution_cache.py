@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from cache import LRUCache
+from metrics import SearchResult, restore_result
+
+
+def solution_key(maze, algorithm, heuristic=None):
+    """Returns the key of the solution of maze by the named algorithm and heuristic, a hex string."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([maze.digest(), maze.start, maze.goal, algorithm, heuristic]).encode())
+    return h.hexdigest()
+
+
+class SolutionCache():
+    """Solutions and metrics of earlier searches, kept in an SQLite database in directory.
+
+    Entries are stored as compressed JSON, and the most recently used ones are
+    also kept in memory, up to memory_bytes. Once the database holds more than
+    max_bytes of entries, the least recently used ones are deleted. Reading an
+    entry only marks it as used in the database with the next write, or on close().
+    """
+
+    def __init__(self, directory, max_bytes=2 ** 30, memory_bytes=64 * 2 ** 20):
+        os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory = LRUCache(memory_bytes, sizeof=len)
+        # Last use of the entries read since the last write, saved with the next one
+        self.used = {}
+        self.db = sqlite3.connect(os.path.join(directory, "solutions.sqlite3"), timeout=30)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions "
+                "(key TEXT PRIMARY KEY, data BLOB NOT NULL, used INTEGER NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used)")
+            # Running totals, so that storing an entry does not add up the whole table
+            self.db.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self.db.execute(
+                "INSERT OR IGNORE INTO metadata "
+                "SELECT 'nbytes', COALESCE(SUM(LENGTH(data)), 0) FROM solutions"
+            )
+
+    def get(self, key):
+        """Returns the entry stored under key, or None if there is none."""
+        data = self.memory.get(key)
+        if data is None:
+            row = self.db.execute("SELECT data FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            data = row[0]
+            self.memory.put(key, data)
+        self.used[key] = time.time_ns()
+        return json.loads(zlib.decompress(data))
+
+    def put(self, key, entry):
+        """Stores the JSON-serializable entry under key, then evicts entries until the database fits."""
+        data = zlib.compress(json.dumps(entry).encode())
+        self.memory.put(key, data)
+        self.used.pop(key, None)
+        with self.db:
+            self.save_used()
+            row = self.db.execute("SELECT LENGTH(data) FROM solutions WHERE key = ?", (key,)).fetchone()
+            self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)", (key, data, time.time_ns()))
+            self.db.execute(
+                "UPDATE metadata SET value = value + ? WHERE name = 'nbytes'",
+                (len(data) - (row[0] if row is not None else 0),)
+            )
+            excess = self.db.execute("SELECT value FROM metadata WHERE name = 'nbytes'").fetchone()[0] - self.max_bytes
+            if excess > 0:
+                evicted = []
+                freed = 0
+                for old_key, size in self.db.execute("SELECT key, LENGTH(data) FROM solutions ORDER BY used"):
+                    if freed >= excess:
+                        break
+                    evicted.append((old_key,))
+                    freed += size
+                self.db.executemany("DELETE FROM solutions WHERE key = ?", evicted)
+                self.db.execute("UPDATE metadata SET value = value - ? WHERE name = 'nbytes'", (freed,))
+                for (old_key,) in evicted:
+                    self.memory.discard(old_key)
+
+    def save_used(self):
+        """Writes the last use of the entries read since the last write to the database."""
+        if self.used:
+            self.db.executemany("UPDATE solutions SET used = ? WHERE key = ?", [(used, key) for key, used in self.used.items()])
+            self.used.clear()
+
+    def close(self):
+        with self.db:
+            self.save_used()
+        self.db.close()
+
+    def solve(self, solver, algorithm, heuristic=None):
+        """Solves the maze of solver, named algorithm, unless the solution is cached, and returns its SearchResult.
+
+        Either way the solver ends up with its solution and metrics set, as after
+        solve(). A solver given its solution from the cache has no explored set.
+        Unlike solve(), no exception is raised when there is no solution.
+        """
+        key = solution_key(solver.maze, algorithm, heuristic)
+        entry = self.get(key)
+        if entry is None:
+            try:
+                solver.solve()
+            except Exception as e:
+                if str(e) != "no solution":
+                    raise
+            self.put(key, {"solution": solver.solution, "result": solver.result.as_dict()})
+            return solver.result
+
+        if entry["solution"] is None:
+            solver.solution = None
+        else:
+            actions, states = entry["solution"]
+            solver.solution = (actions, [tuple(state) for state in states])
+        solver.explored = None
+        return restore_result(solver, SearchResult(**entry["result"]))
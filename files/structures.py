@@ -1,29 +1,120 @@
+import heapq
+import itertools
+from collections import deque
+
+
+class CellSet():
+    """Set of integer cell ids in a maze of size cells, stored as one bit per cell."""
+
+    def __init__(self, size):
+        self.bits = bytearray((size + 7) // 8)
+        self.count = 0
+
+    def add(self, cell):
+        if not self.bits[cell >> 3] >> (cell & 7) & 1:
+            self.bits[cell >> 3] |= 1 << (cell & 7)
+            self.count += 1
+
+    def discard(self, cell):
+        if self.bits[cell >> 3] >> (cell & 7) & 1:
+            self.bits[cell >> 3] &= ~(1 << (cell & 7))
+            self.count -= 1
+
+    def __contains__(self, cell):
+        return self.bits[cell >> 3] >> (cell & 7) & 1 == 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for i, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield i * 8 + bit
+
+
 class Stack():
-    def __init__(self):
-        self.list = []
+    def __init__(self, size=None):
+        self.list = deque()
+        # States currently in the frontier, for constant time membership tests.
+        # Given the number of cells, integer states are tracked in a bitmap
+        self.states = set() if size is None else CellSet(size)
 
-    def add(self, node):
-        self.list.append(node)
+    def add(self, state):
+        self.list.append(state)
+        self.states.add(state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.list)
+        return state in self.states
 
     def empty(self):
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
     def remove(self):
         if self.empty():
             raise Exception("Empty Stack")
         else:
-            node = self.list[-1]
-            self.list = self.list[:-1]
-            return node
+            state = self.list.pop()
+            self.states.discard(state)
+            return state
 
 class Queue(Stack):
     def remove(self):
         if self.empty():
             raise Exception("Empty Queue")
         else:
-            node = self.list[0]
-            self.list = self.list[1:]
-            return node
\ No newline at end of file
+            state = self.list.popleft()
+            self.states.discard(state)
+            return state
+
+class PriorityQueue():
+    def __init__(self):
+        self.heap = []
+        # Latest heap entry of every state in the frontier, superseded entries
+        # stay in the heap and are skipped when they reach the top
+        self.entries = {}
+        # Ties on priority are broken in insertion order
+        self.counter = itertools.count()
+
+    def add(self, state, priority):
+        entry = (priority, next(self.counter), state)
+        self.entries[state] = entry
+        heapq.heappush(self.heap, entry)
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def discard(self, state):
+        """Removes state from the frontier if it is there, its heap entry is skipped later."""
+        self.entries.pop(state, None)
+
+    def priority(self, state):
+        return self.entries[state][0]
+
+    def empty(self):
+        return len(self.entries) == 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def top_priority(self):
+        """Returns the priority of the state remove() would return next."""
+        if self.empty():
+            raise Exception("Empty Priority Queue")
+        while self.entries.get(self.heap[0][2]) is not self.heap[0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0]
+
+    def remove(self):
+        if self.empty():
+            raise Exception("Empty Priority Queue")
+        while True:
+            entry = heapq.heappop(self.heap)
+            state = entry[2]
+            if self.entries.get(state) is entry:
+                del self.entries[state]
+                return state
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+# Disjoint sets over the integers 0..n-1, held in a NumPy parent array in
+# which every set's root is its smallest member. The operations work on whole
+# arrays of items at once, so merging millions of pairs takes a handful of
+# vectorized passes rather than a Python loop per pair.
+def make_sets(n):
+    """Returns the parent array of n singleton sets."""
+    return np.arange(n, dtype=np.int32 if n < 2 ** 31 else np.int64)
+
+
+def flatten(parent):
+    """Points every item of parent straight at its root, in place, by pointer jumping."""
+    # Only the items whose parent is not a root need another jump
+    items = np.nonzero(parent[parent] != parent)[0]
+    while len(items):
+        parent[items] = parent[parent[items]]
+        items = items[parent[parent[items]] != parent[items]]
+    return parent
+
+
+def union(parent, a, b):
+    """Merges the sets of a[i] and b[i] for every i, and leaves parent flattened.
+
+    Each pass hooks the larger root of every pair still apart under the smallest
+    root it is paired with, so no cycle can form, then flattens again.
+    """
+    while len(a):
+        flatten(parent)
+        root_a, root_b = parent[a], parent[b]
+        apart = root_a != root_b
+        if not apart.any():
+            break
+        a, b, root_a, root_b = a[apart], b[apart], root_a[apart], root_b[apart]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+    return parent
+
+
+def label_components(open_cells):
+    """Returns an array giving every cell of a 2-D boolean grid its component id, -1 for closed cells.
+
+    Cells are connected through their open up, down, left and right neighbors.
+    Each horizontal run of open cells starts out as one set, so only the
+    vertical links between runs have to be merged. Component ids are the ids of
+    their first run in row-major order, so they are not consecutive.
+    """
+    height, width = open_cells.shape
+
+    # Number the runs in row-major order, run_ids holding the run of each open cell
+    starts = open_cells.copy()
+    starts[:, 1:] &= ~open_cells[:, :-1]
+    parent = make_sets(int(starts.sum()))
+    run_ids = np.cumsum(starts.ravel(), dtype=parent.dtype).reshape(height, width) - 1
+
+    # Merge the runs of every pair of vertically adjacent open cells
+    linked = open_cells[:-1] & open_cells[1:]
+    union(parent, run_ids[:-1][linked], run_ids[1:][linked])
+
+    labels = np.full((height, width), -1, dtype=parent.dtype)
+    labels[open_cells] = parent[run_ids[open_cells]]
+    return labels